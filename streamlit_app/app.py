@@ -1,12 +1,43 @@
-import re
+import os
 from datetime import datetime
-from typing import List
+from typing import Dict, List
 
-import pandas as pd
 import streamlit as st
 
-from llm_client import generate_report
-from report_engine import EventInput
+from incremental import IncrementalReportBuilder
+from llm_client import (
+    OPENAI_ENABLED,
+    OPENAI_STREAM,
+    REPORT_HISTORY,
+    generate_report,
+    generate_reports,
+    stream_report,
+    targeted_base,
+    targeted_fields,
+    update_report,
+)
+from metrics import RequestTrace, serve_metrics, timed
+from prompt_parser import iter_events, parse_prompt
+from report_cache import report_identity
+from report_engine import EventInput, Report
+from report_export import opportunities_csv
+from report_formatter import format_report_as_markdown
+from transcript import Transcript
+
+HISTORY_PAGE_SIZE = 10
+TRANSCRIPT_PAGE_SIZE = 10
+
+OPPORTUNITY_COLUMNS = {
+    "ticker": "Ticker",
+    "company": "Company",
+    "sector": "Sector",
+    "country": "Country",
+    "expected_direction": "Expected Direction",
+    "time_horizon": "Time Horizon",
+    "mechanism": "Mechanism of Impact",
+    "investability_score": "Investability Score",
+    "rationale": "Rationale",
+}
 
 
 st.set_page_config(
@@ -15,71 +46,19 @@ st.set_page_config(
     layout="wide",
 )
 
+if os.getenv("METRICS_PORT"):
+    serve_metrics(int(os.environ["METRICS_PORT"]))
+
 if "report" not in st.session_state:
     st.session_state.report = None
+    st.session_state.report_id = None
+    # The event behind the current report, so the next prompt can be applied as an edit.
+    st.session_state.event = None
+    st.session_state.report_builder = IncrementalReportBuilder()
 
-if "messages" not in st.session_state:
-    st.session_state.messages: List[dict] = []
-
-
-def _split_driver_line(text: str) -> List[str]:
-    parts = re.split(r"[;,•]", text)
-    return [part.strip("-• ").strip() for part in parts if part.strip("-• ").strip()]
-
-
-def _parse_prompt(prompt: str) -> EventInput:
-    lines_raw = prompt.splitlines()
-    lines = [line.strip() for line in lines_raw if line.strip()]
-
-    name = ""
-    timing = ""
-    drivers: List[str] = []
-    description_parts: List[str] = []
-    capture_drivers = False
-
-    for raw_line in lines_raw:
-        line = raw_line.strip()
-        if not line:
-            capture_drivers = False
-            continue
-
-        lower = line.lower()
-        if lower.startswith("event:"):
-            name = line.split(":", 1)[1].strip()
-            capture_drivers = False
-            continue
-        if lower.startswith("timing:"):
-            timing = line.split(":", 1)[1].strip()
-            capture_drivers = False
-            continue
-        if lower.startswith("drivers:"):
-            rest = line.split(":", 1)[1].strip()
-            drivers.extend(_split_driver_line(rest))
-            capture_drivers = True
-            continue
-        if capture_drivers and (line.startswith("-") or line.startswith("•") or line.startswith("*")):
-            drivers.append(line.lstrip("-•*").strip())
-            continue
-
-        description_parts.append(line)
-
-    if not name and lines:
-        name = lines[0]
-        description_parts = lines[1:]
-
-    if not drivers and description_parts:
-        # Attempt to infer drivers from semicolon- or comma-separated clauses in description.
-        inferred = _split_driver_line("; ".join(description_parts))
-        drivers = inferred[:4]
-
-    description = " ".join(description_parts) if description_parts else prompt.strip()
-
-    return EventInput(
-        name=name,
-        expected_timing=timing,
-        description=description,
-        key_drivers=drivers,
-    )
+if "transcript" not in st.session_state:
+    st.session_state.transcript = Transcript()
+    st.session_state.transcript_older = 0
 
 
 def _render_placeholder():
@@ -112,20 +91,103 @@ st.markdown(
     "Describe a forward catalyst to generate a cross-sector opportunity set aligned with a sell-side briefing format."
 )
 
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        st.markdown(message["content"])
-
-
-def _store_report(report_data: dict, source_note: str):
-    st.session_state.report = report_data
+def _render_transcript():
+    # Only the bounded recent window renders by default; spilled turns are read
+    # from disk a page at a time when asked for.
+    transcript = st.session_state.transcript
+    shown_older = min(st.session_state.transcript_older, transcript.spilled)
+    if shown_older < transcript.spilled:
+        remaining = transcript.spilled - shown_older
+        if st.button(f"Load older messages ({remaining} more)", key="transcript_load_older"):
+            st.session_state.transcript_older = shown_older + TRANSCRIPT_PAGE_SIZE
+            _trigger_rerun()
+    for message in [*transcript.older(shown_older), *transcript.recent]:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+
+def _store_report(report_data: dict, source_note: str, event_input: EventInput):
+    # Retained as the typed model: slotted, with securities shared across reports.
+    st.session_state.report = Report.from_dict(report_data)
+    st.session_state.event = event_input
+    st.session_state.report_id = report_identity(report_data)
     ack = (
         f"Generated assessment for **{report_data['event_name']}** "
         f"({report_data['market_impact']['sentiment']} sentiment). Scroll to view the dashboard."
     )
     if source_note:
         ack += f"\n\n_{source_note}_"
-    st.session_state.messages.append({"role": "assistant", "content": ack})
+    st.session_state.transcript.append("assistant", ack)
+
+
+def _store_batch(events: List[EventInput]):
+    # A pasted note with several Event: blocks is generated as a batch; the first report is shown.
+    with st.spinner(f"Generating {len(events)} reports…"):
+        results = generate_reports(events)
+    _store_report(*results[0], events[0])
+    listing = "\n".join(f"- {report['event_name']} ({report['market_impact']['sentiment']})" for report, _ in results)
+    if REPORT_HISTORY.enabled:
+        where = "Open the others from the report history in the sidebar."
+    else:
+        where = "Report history is disabled, so only the first is kept."
+    st.session_state.transcript.append("assistant", f"Parsed {len(events)} events from the message:\n{listing}\n\n{where}")
+
+
+def _render_stream(event_input: EventInput, trace: RequestTrace):
+    import pandas as pd
+
+    # Fill placeholders section by section so content shows up before the full response lands.
+    with st.chat_message("assistant"):
+        headline_slot = st.empty()
+        context_slot = st.empty()
+        impact_slot = st.empty()
+        table_slot = st.empty()
+        rows: List[dict] = []
+        for section, value in stream_report(event_input, trace):
+            if section == "complete":
+                return value
+            if section == "headline_summary":
+                headline_slot.markdown(f"**{value}**")
+            elif section == "event_context" and isinstance(value, dict):
+                context_slot.markdown(f"**Event Context:** {value.get('overview', '')}")
+            elif section == "market_impact" and isinstance(value, dict):
+                themes = "; ".join(str(theme) for theme in value.get("macro_themes", []))
+                impact_slot.markdown(f"**Sentiment:** {value.get('sentiment', '')}  \n**Macro Themes:** {themes}")
+            elif section == "opportunity":
+                rows.append(value)
+                table_slot.dataframe(pd.DataFrame(rows), use_container_width=True)
+    return generate_report(event_input, trace)
+
+
+# Keyed on the report identity only (the leading underscore keeps Streamlit from
+# hashing the report itself). The artifacts are only displayed, never mutated,
+# so they are shared from the resource cache instead of copied on every rerun.
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _render_artifacts(report_id: str, _report: Report) -> Dict[str, object]:
+    # pandas is imported on the first dashboard render, keeping it off the cold-start path.
+    import pandas as pd
+
+    data = _report.to_dict()
+    context = data["event_context"]
+    impact = data["market_impact"]
+    with timed("build_horizon_frame"):
+        horizon_df = pd.DataFrame(impact["horizon_impacts"])
+    with timed("build_opportunity_frame"):
+        opportunity_df = pd.DataFrame(data["opportunities"])
+        if "sources" in opportunity_df:
+            opportunity_df["Source(s)"] = opportunity_df.pop("sources").str.join("; ")
+        opportunity_df = opportunity_df.rename(columns=OPPORTUNITY_COLUMNS)
+    generated_at = datetime.fromisoformat(data["generated_at"]).strftime("%Y-%m-%d %H:%M:%S UTC")
+    return {
+        "generated_at": generated_at,
+        "context_points": "\n".join(f"- {point}" for point in context["context_points"]),
+        "macro_themes": "\n".join(f"- {theme}" for theme in impact["macro_themes"]),
+        "sector_outlook": "\n".join(f"- {outlook}" for outlook in impact["sector_outlook"]),
+        "horizon_df": horizon_df,
+        "opportunity_df": opportunity_df,
+        "opportunity_csv": opportunities_csv(data),
+        "markdown": format_report_as_markdown(data),
+    }
 
 
 def _trigger_rerun():
@@ -134,13 +196,68 @@ def _trigger_rerun():
         rerun_fn()
 
 
+def _render_history():
+    # Pages through stored summaries newest first; a report body is only read when opened.
+    if not REPORT_HISTORY.enabled:
+        return
+    with st.sidebar:
+        st.subheader("Report history")
+        event = st.text_input("Event name starts with", key="history_event").strip()
+        ticker = st.text_input("Ticker", key="history_ticker").strip()
+        sentiment = st.selectbox("Sentiment", ["Any", "Bullish", "Bearish", "Neutral"], key="history_sentiment")
+        filters = {"event": event or None, "ticker": ticker or None, "sentiment": None if sentiment == "Any" else sentiment}
+        if st.session_state.get("history_filters") != filters:
+            st.session_state.history_filters = filters
+            st.session_state.history_cursors = [None]
+
+        cursors = st.session_state.history_cursors
+        page = REPORT_HISTORY.page(limit=HISTORY_PAGE_SIZE + 1, before=cursors[-1], **filters)
+        has_older = len(page) > HISTORY_PAGE_SIZE
+        page = page[:HISTORY_PAGE_SIZE]
+        st.caption(f"{REPORT_HISTORY.count(**filters)} stored reports")
+        for summary in page:
+            label = f"{summary.generated_at[:16].replace('T', ' ')} · {summary.event_name} ({summary.sentiment})"
+            if st.button(label, key=f"history_{summary.id}", use_container_width=True):
+                stored = REPORT_HISTORY.get(summary.id)
+                if stored:
+                    st.session_state.report = Report.from_dict(stored)
+                    st.session_state.report_id = report_identity(stored)
+                    st.session_state.event = None
+                    _trigger_rerun()
+
+        newer, older = st.columns(2)
+        if newer.button("Newer", disabled=len(cursors) == 1, use_container_width=True):
+            cursors.pop()
+            _trigger_rerun()
+        if older.button("Older", disabled=not has_older, use_container_width=True):
+            cursors.append(page[-1].cursor)
+            _trigger_rerun()
+
+
+_render_transcript()
+_render_history()
+
 prompt = st.chat_input("Event, timing, drivers… (use Event:/Timing:/Drivers: for best results)")
 
 if prompt:
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    event_input = _parse_prompt(prompt)
-    report, source = generate_report(event_input)
-    _store_report(report, source)
+    st.session_state.transcript.append("user", prompt)
+    st.session_state.transcript_older = 0
+    trace = RequestTrace()
+    with trace.stage("parse_prompt"):
+        events = list(iter_events(prompt)) or [parse_prompt(prompt)]
+    if len(events) > 1:
+        _store_batch(events)
+    else:
+        event_input = events[0]
+        previous_event = st.session_state.event
+        previous = (previous_event, st.session_state.report.to_dict()) if previous_event else None
+        targeted = previous is not None and targeted_base(previous[1])
+        # A targeted update is a short response, so it is not worth streaming.
+        if OPENAI_ENABLED and OPENAI_STREAM and (not targeted or targeted_fields(previous_event, event_input) is None):
+            report, source = _render_stream(event_input, trace)
+        else:
+            report, source = update_report(event_input, previous, st.session_state.report_builder, trace)
+        _store_report(report, source, event_input)
     _trigger_rerun()
 
 
@@ -153,62 +270,57 @@ if not report:
     st.stop()
 
 
-generated_at = datetime.fromisoformat(report["generated_at"]).strftime("%Y-%m-%d %H:%M:%S UTC")
-st.caption(f"Generated: {generated_at}")
+artifacts = _render_artifacts(st.session_state.report_id, report)
+st.caption(f"Generated: {artifacts['generated_at']}")
 
 st.divider()
 
-context = report["event_context"]
-impact = report["market_impact"]
+context = report.event_context
+impact = report.market_impact
 
 col_left, col_right = st.columns(2)
 
 with col_left:
     st.subheader("Headline Summary")
-    st.write(report["headline_summary"])
+    st.write(report.headline_summary)
 
     st.subheader("Event Context")
-    st.write(context["overview"])
-    if context["timing"]:
-        st.markdown(f"**Timing:** {context['timing']}")
-    if context["significance"]:
-        st.markdown(f"**Significance:** {context['significance']}")
-    if context["context_points"]:
+    st.write(context.overview)
+    if context.timing:
+        st.markdown(f"**Timing:** {context.timing}")
+    if context.significance:
+        st.markdown(f"**Significance:** {context.significance}")
+    if context.context_points:
         st.markdown("**Key Drivers**")
-        st.markdown("\n".join(f"- {point}" for point in context["context_points"]))
+        st.markdown(artifacts["context_points"])
 
 with col_right:
     st.subheader("Market Impact Analysis")
-    st.metric("Sentiment", impact["sentiment"])
-    if impact["macro_themes"]:
+    st.metric("Sentiment", impact.sentiment)
+    if impact.macro_themes:
         st.markdown("**Macro Themes**")
-        st.markdown("\n".join(f"- {theme}" for theme in impact["macro_themes"]))
-    if impact["sector_outlook"]:
+        st.markdown(artifacts["macro_themes"])
+    if impact.sector_outlook:
         st.markdown("**Sector Exposure**")
-        st.markdown("\n".join(f"- {outlook}" for outlook in impact["sector_outlook"]))
+        st.markdown(artifacts["sector_outlook"])
 
-    horizon_df = pd.DataFrame(impact["horizon_impacts"])
     st.markdown("**Horizon Outlook**")
-    st.table(horizon_df)
+    st.table(artifacts["horizon_df"])
 
 st.divider()
 
 st.subheader("Investment Opportunity Table (20+ entries)")
-opportunities = report["opportunities"]
-opportunity_df = pd.DataFrame(opportunities)
-opportunity_df["Source(s)"] = opportunity_df["sources"].apply(lambda items: "; ".join(items))
-opportunity_df = opportunity_df.drop(columns=["sources"])
-opportunity_df = opportunity_df.rename(
-    columns={
-        "ticker": "Ticker",
-        "company": "Company",
-        "sector": "Sector",
-        "country": "Country",
-        "expected_direction": "Expected Direction",
-        "time_horizon": "Time Horizon",
-        "mechanism": "Mechanism of Impact",
-        "investability_score": "Investability Score",
-        "rationale": "Rationale",
-    }
+st.dataframe(artifacts["opportunity_df"], use_container_width=True, height=600)
+
+csv_col, markdown_col = st.columns(2)
+csv_col.download_button(
+    "Download opportunities (CSV)", artifacts["opportunity_csv"], file_name="opportunities.csv", mime="text/csv"
 )
-st.dataframe(opportunity_df, use_container_width=True, height=600)
+markdown_col.download_button(
+    "Download report (Markdown)", artifacts["markdown"], file_name="report.md", mime="text/markdown"
+)
+
+trace_data = (report.metadata or {}).get("trace")
+if trace_data:
+    with st.expander("Request trace"):
+        st.json(trace_data)
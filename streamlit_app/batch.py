@@ -0,0 +1,249 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from llm_client import MOCK_NOTE, OPENAI_BATCH_WORKERS, OPENAI_ENABLED, REPORT_HISTORY, generate_report
+from prompt_parser import iter_events, parse_prompt
+from report_engine import EventInput, build_mock_report
+
+MOCK_CHUNK_SIZE = 32
+
+Record = Tuple[str, Dict[str, object]]
+Result = Tuple[str, Dict[str, object], str, float]
+
+
+def read_records(path: str) -> Iterator[Record]:
+    # Records are a prompt string, {"prompt": ...} or the EventInput fields; an
+    # "id" key names the record for resuming, otherwise its line number does.
+    with open(path, "r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield f"line-{line_number}", {"error": f"invalid JSON: {exc}"}
+                continue
+            if not isinstance(record, dict):
+                record = {"prompt": record}
+            yield str(record.get("id", f"line-{line_number}")), record
+
+
+def read_document(path: str) -> Iterator[Record]:
+    # A plain-text note or newswire dump; each "Event:" block is a record, named by its position.
+    with open(path, "r", encoding="utf-8") as handle:
+        text = handle.read()
+    for number, event_input in enumerate(iter_events(text), 1):
+        yield f"event-{number}", {"event": event_input}
+
+
+def record_event(record: Dict[str, object]) -> EventInput:
+    if "error" in record:
+        raise ValueError(record["error"])
+    event_input = record.get("event")
+    if isinstance(event_input, EventInput):
+        return event_input
+    prompt = record.get("prompt")
+    if isinstance(prompt, str):
+        return parse_prompt(prompt)
+    if not record.get("name"):
+        raise ValueError("record needs a prompt or an event name")
+    drivers = record.get("key_drivers") or []
+    return EventInput(
+        name=str(record["name"]),
+        expected_timing=str(record.get("expected_timing", "")),
+        description=str(record.get("description", "")),
+        key_drivers=[str(driver) for driver in drivers] if isinstance(drivers, list) else [str(drivers)],
+    )
+
+
+def completed_ids(path: str) -> Tuple[Set[str], Set[str]]:
+    # (ids with a report, ids with an error line). Read a line at a time so a
+    # long output is never held in memory; a crash can leave a half-written
+    # last line, which is cut off so appends start clean.
+    done: Set[str] = set()
+    failed: Set[str] = set()
+    if not os.path.exists(path):
+        return done, failed
+    end = 0
+    with open(path, "rb+") as handle:
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break
+            end += len(line)
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(result, dict):
+                continue
+            if "report" in result:
+                done.add(str(result.get("id")))
+            elif "error" in result:
+                failed.add(str(result.get("id")))
+        if handle.seek(0, os.SEEK_END) > end:
+            handle.truncate(end)
+    return done, failed - done
+
+
+def _mock_chunk(events: List[Tuple[str, EventInput]]) -> List[Result]:
+    results: List[Result] = []
+    for record_id, event_input in events:
+        started = time.perf_counter()
+        report = build_mock_report(event_input)
+        results.append((record_id, report, MOCK_NOTE, time.perf_counter() - started))
+    return results
+
+
+def _llm_chunk(events: List[Tuple[str, EventInput]]) -> List[Result]:
+    results: List[Result] = []
+    for record_id, event_input in events:
+        started = time.perf_counter()
+        report, note = generate_report(event_input)
+        results.append((record_id, report, note, time.perf_counter() - started))
+    return results
+
+
+def _chunks(records: Iterable[Tuple[str, EventInput]], size: int) -> Iterator[List[Tuple[str, EventInput]]]:
+    chunk: List[Tuple[str, EventInput]] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class BatchStats:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+        self.outcomes: Counter = Counter()
+        self.latencies: List[float] = []
+
+    def quantile(self, q: float) -> float:
+        samples = sorted(self.latencies)
+        return samples[min(len(samples) - 1, int(q * len(samples)))] if samples else 0.0
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        rate = self.written / elapsed if elapsed else 0.0
+        lines = [
+            f"Wrote {self.written} reports in {elapsed:.1f} s ({rate:.1f} reports/s); "
+            f"{self.skipped} already done, {self.failed} failed",
+            f"Per-report latency p50 {self.quantile(0.5) * 1000:.1f} ms, p95 {self.quantile(0.95) * 1000:.1f} ms",
+        ]
+        if self.outcomes:
+            lines.append("Outcomes: " + ", ".join(f"{name} {count}" for name, count in self.outcomes.most_common()))
+        return "\n".join(lines)
+
+
+def _write(handle: TextIO, payload: Dict[str, object]) -> None:
+    handle.write(json.dumps(payload, ensure_ascii=False, default=str) + "\n")
+
+
+def run_batch(
+    input_path: str,
+    output_path: str,
+    workers: Optional[int] = None,
+    use_llm: bool = OPENAI_ENABLED,
+    chunk_size: Optional[int] = None,
+    resume: bool = True,
+    document: bool = False,
+) -> BatchStats:
+    # Results are appended as chunks finish, in completion order, and flushed
+    # so a crash loses at most the chunks still in flight.
+    stats = BatchStats()
+    done, failed = completed_ids(output_path) if resume else (set(), set())
+    if use_llm:
+        workers = workers or OPENAI_BATCH_WORKERS
+        chunk_size = chunk_size or 1
+        executor: Executor = ThreadPoolExecutor(max_workers=workers)
+        run_chunk = _llm_chunk
+    else:
+        # Imported here: multiprocessing is only needed for the rule-based path.
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = workers or os.cpu_count() or 1
+        chunk_size = chunk_size or MOCK_CHUNK_SIZE
+        executor = ProcessPoolExecutor(max_workers=workers)
+        run_chunk = _mock_chunk
+
+    with open(output_path, "a" if resume else "w", encoding="utf-8") as handle:
+
+        def pending_events() -> Iterator[Tuple[str, EventInput]]:
+            for record_id, record in (read_document if document else read_records)(input_path):
+                if record_id in done:
+                    stats.skipped += 1
+                    continue
+                try:
+                    event_input = record_event(record)
+                except ValueError as exc:
+                    stats.failed += 1
+                    # Still retried in case the input was fixed, but an error already on file is not repeated.
+                    if record_id not in failed:
+                        _write(handle, {"id": record_id, "error": str(exc)})
+                    continue
+                done.add(record_id)
+                yield record_id, event_input
+
+        def drain(futures: Set[Future]) -> Set[Future]:
+            finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                results = future.result()
+                if not use_llm:
+                    REPORT_HISTORY.add_many((report, "mock") for _, report, _, _ in results)
+                for record_id, report, note, seconds in results:
+                    _write(handle, {"id": record_id, "source": note, "elapsed_ms": round(seconds * 1000, 3), "report": report})
+                    stats.written += 1
+                    stats.latencies.append(seconds)
+                    stats.outcomes[(report.get("metadata") or {}).get("trace", {}).get("outcome", "mock")] += 1
+            handle.flush()
+            return futures
+
+        with executor:
+            # A bounded window keeps memory flat however long the input is.
+            in_flight: Set[Future] = set()
+            for chunk in _chunks(pending_events(), chunk_size):
+                in_flight.add(executor.submit(run_chunk, chunk))
+                if len(in_flight) >= workers * 2:
+                    in_flight = drain(in_flight)
+            while in_flight:
+                in_flight = drain(in_flight)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate reports for a JSONL file of prompts or events.")
+    parser.add_argument("input", help="JSONL of prompt strings, {\"prompt\": ...} or EventInput fields, with optional \"id\"")
+    parser.add_argument("--document", action="store_true", help="input is plain text with one or more Event: blocks")
+    parser.add_argument("output", help="JSONL to append results to")
+    parser.add_argument("--workers", type=int, help="threads for LLM calls, processes for the rule-based engine")
+    parser.add_argument("--chunk-size", type=int, help="records per task (default 1 for LLM calls, 32 otherwise)")
+    parser.add_argument("--mock", action="store_true", help="use the rule-based engine even when an API key is set")
+    parser.add_argument("--restart", action="store_true", help="overwrite the output instead of resuming it")
+    args = parser.parse_args(argv)
+
+    stats = run_batch(
+        args.input,
+        args.output,
+        workers=args.workers,
+        use_llm=OPENAI_ENABLED and not args.mock,
+        chunk_size=args.chunk_size,
+        resume=not args.restart,
+        document=args.document,
+    )
+    print(stats.summary())
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import argparse
+import json
+import re
+import timeit
+from typing import Callable, Dict, Optional
+
+from benchmarks.suite import _llm_text, _payload
+from json_stream import JSON_BACKEND, find_json_object
+
+
+def _regex_extract(raw_text: str) -> Optional[str]:
+    if not raw_text:
+        return None
+    text = raw_text.strip()
+    if text.startswith("```"):
+        text = re.sub(r"^```json\s*", "", text)
+        text = re.sub(r"^```\s*", "", text)
+        text = text.strip("`")
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    return match.group(0) if match else None
+
+
+def _regex_parse(text: str) -> Optional[Dict[str, object]]:
+    payload = _regex_extract(text)
+    if not payload:
+        return None
+    try:
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+def _payloads(size: int) -> Dict[str, str]:
+    # The suite's reply ends in a note with braces; the plain fence has nothing after it.
+    body = "```json\n" + json.dumps(_payload(size), indent=2, ensure_ascii=False) + "\n```"
+    return {
+        "plain fenced report": body,
+        "fenced + braced note": _llm_text(size),
+        "trailing prose with braces": body + "\nCaveats: {see appendix} and {risk table}." * 50,
+        "leading brace noise": "Template {x} " * 20000 + body,
+        "truncated report": body[: len(body) // 2],
+        "deep unbalanced nesting": "{" * 50000 + '"a": 1',
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare regex JSON extraction with the single-pass extractor.")
+    parser.add_argument("--size", type=int, default=2000, help="opportunities in the synthetic LLM payload")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"JSON backend: {JSON_BACKEND}")
+    print(f"{'payload':<28} {'chars':>10} {'regex+loads':>12} {'single pass':>12} {'regex ok':>9} {'new ok':>7}")
+    for name, text in _payloads(args.size).items():
+        runners: Dict[str, Callable[[], object]] = {
+            "regex": lambda: _regex_parse(text),
+            "single": lambda: find_json_object(text)[1],
+        }
+        timings = {
+            label: min(timeit.repeat(runner, number=1, repeat=args.repeat)) * 1000 for label, runner in runners.items()
+        }
+        print(
+            f"{name:<28} {len(text):>10} {timings['regex']:>10.2f}ms {timings['single']:>10.2f}ms "
+            f"{str(_regex_parse(text) is not None):>9} {str(find_json_object(text)[1] is not None):>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
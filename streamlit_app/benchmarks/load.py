@@ -0,0 +1,85 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from benchmarks.stats import percentile
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Drive generate_report against an OpenAI-compatible endpoint.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8799/v1", help="endpoint to load (the stub by default)")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--async", dest="use_async", action="store_true", help="use agenerate_report on one async client instead of threads")
+    parser.add_argument("--timeout", type=float, help="latency budget per request for the async path")
+    args = parser.parse_args(argv)
+
+    # llm_client reads its configuration at import time, so set it up first.
+    os.environ["OPENAI_BASE_URL"] = args.base_url
+    os.environ.setdefault("OPENAI_API_KEY", "stub-key")
+    os.environ["REPORT_CACHE_TTL"] = "0"
+    # Synthetic reports stay out of the real history, and SQLite writes out of the latencies.
+    os.environ["REPORT_HISTORY_PATH"] = ""
+
+    import llm_client
+    from report_engine import EventInput
+
+    events = [
+        EventInput(
+            name=f"Load test catalyst {index}",
+            expected_timing="Q1 2025",
+            description="Policy support and investment growth across semiconductor supply chains.",
+            key_drivers=["subsidy pool", f"anchor fab {index}", "tariff easing"],
+        )
+        for index in range(args.requests)
+    ]
+    results: List[Tuple[float, str]] = []
+
+    def timed(event_input: "EventInput") -> Tuple[float, str]:
+        started = time.perf_counter()
+        _, note = llm_client.generate_report(event_input)
+        return time.perf_counter() - started, note
+
+    async def timed_async() -> List[Tuple[float, str]]:
+        semaphore = asyncio.Semaphore(args.concurrency)
+        client = llm_client._async_client()
+
+        async def one(event_input: "EventInput") -> Tuple[float, str]:
+            started = time.perf_counter()
+            _, note = await llm_client.agenerate_report(
+                event_input, client=client, semaphore=semaphore, timeout=args.timeout
+            )
+            return time.perf_counter() - started, note
+
+        try:
+            return list(await asyncio.gather(*(one(event_input) for event_input in events)))
+        finally:
+            await client.close()
+
+    started = time.perf_counter()
+    if args.use_async:
+        results = asyncio.run(timed_async())
+    else:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(executor.map(timed, events))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    fallbacks = sum(1 for _, note in results if "reverted to rule-based" in note)
+    print(f"requests:     {len(results)} at concurrency {args.concurrency} ({'async' if args.use_async else 'threads'})")
+    print(f"wall time:    {elapsed:.2f} s")
+    print(f"throughput:   {len(results) / elapsed:.2f} req/s")
+    print(
+        f"latency:      p50 {percentile(latencies, 0.5) * 1000:.0f} ms  p95 {percentile(latencies, 0.95) * 1000:.0f} ms  "
+        f"p99 {percentile(latencies, 0.99) * 1000:.0f} ms  max {latencies[-1] * 1000 if latencies else 0:.0f} ms"
+    )
+    print(f"fallbacks:    {fallbacks} ({fallbacks / max(1, len(results)):.1%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+import argparse
+import gc
+import json
+import timeit
+import tracemalloc
+from typing import Callable, List
+
+from report_engine import EventInput, Report, build_mock_report
+
+
+def _retained_kib(build: Callable[[], List[object]]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return retained / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare memory retained by report dicts and the typed report model.")
+    parser.add_argument("--reports", type=int, default=500)
+    args = parser.parse_args()
+
+    events = [
+        EventInput(f"Catalyst {index}", "Q1 2025", "Policy support and investment growth.", ["subsidy pool", f"anchor fab {index}"])
+        for index in range(args.reports)
+    ]
+    mock = [build_mock_report(event_input) for event_input in events]
+    # Reports read back from the cache, history or an LLM response own fresh copies of every string.
+    encoded = [json.dumps(report) for report in mock]
+
+    cases = {
+        "rule-based": (
+            lambda: [build_mock_report(event_input) for event_input in events],
+            lambda: [Report.from_dict(build_mock_report(event_input)) for event_input in events],
+        ),
+        "decoded from JSON": (
+            lambda: [json.loads(text) for text in encoded],
+            lambda: [Report.from_dict(json.loads(text)) for text in encoded],
+        ),
+    }
+    print(f"{'reports':<22} {'dicts KiB':>10} {'model KiB':>10} {'saved':>7}")
+    for label, (dicts, models) in cases.items():
+        as_dicts = _retained_kib(dicts)
+        as_models = _retained_kib(models)
+        print(f"{label:<22} {as_dicts:>10.0f} {as_models:>10.0f} {1 - as_models / as_dicts:>7.0%}")
+
+    models = [Report.from_dict(report) for report in mock]
+    to_dict = min(timeit.repeat(lambda: [model.to_dict() for model in models], number=1, repeat=5))
+    from_dict = min(timeit.repeat(lambda: [Report.from_dict(report) for report in mock], number=1, repeat=5))
+    print(f"\nfrom_dict {from_dict / len(mock) * 1e6:.1f} us/report, to_dict {to_dict / len(mock) * 1e6:.1f} us/report")
+
+
+if __name__ == "__main__":
+    main()
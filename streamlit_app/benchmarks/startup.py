@@ -0,0 +1,145 @@
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Set, Tuple
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_baseline.json")
+
+# Dependencies that must stay off the import path until they are actually used.
+DEFERRED_MODULES = ("openai", "pandas", "numpy", "pyarrow", "http.server", "multiprocessing")
+
+ImportRow = Tuple[str, int, int, int]
+
+
+def app_imports() -> str:
+    # app.py runs Streamlit calls at import, so time its module-level imports instead.
+    with open(os.path.join(APP_DIR, "app.py"), "r", encoding="utf-8") as handle:
+        tree = ast.parse(handle.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return "import " + ", ".join(dict.fromkeys(modules))
+
+
+def _targets() -> Dict[str, str]:
+    return {
+        "app": app_imports(),
+        "llm_client": "import llm_client",
+        "report_engine": "import report_engine",
+    }
+
+
+def parse_importtime(stderr: str) -> List[ImportRow]:
+    # Each row: (module, depth, self_us, cumulative_us).
+    rows: List[ImportRow] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def _run(statement: str, env: Dict[str, str]) -> Tuple[float, List[ImportRow]]:
+    script = f"import time; started = time.perf_counter(); {statement}; print(time.perf_counter() - started)"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=APP_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
+
+
+def interpreter_modules(env: Dict[str, str]) -> Set[str]:
+    # Imported by site before the statement runs; not attributable to the app.
+    return {name for name, _, _, _ in _run("pass", env)[1]}
+
+
+def measure(statement: str, repeat: int, env: Dict[str, str], exclude: Set[str]) -> Dict[str, object]:
+    walls: List[float] = []
+    runs: List[List[ImportRow]] = []
+    for _ in range(repeat):
+        wall, rows = _run(statement, env)
+        walls.append(wall)
+        runs.append(rows)
+    # Report the per-module breakdown of the median run.
+    median_index = sorted(range(repeat), key=walls.__getitem__)[repeat // 2]
+    rows = [row for row in runs[median_index] if row[0] not in exclude]
+    loaded = {name for name, _, _, _ in rows}
+    return {
+        "wall_ms": statistics.median(walls) * 1000,
+        "modules": len(rows),
+        "top_level": {name: cumulative / 1000 for name, depth, _, cumulative in rows if depth == 0},
+        "heaviest": sorted(((name, cumulative / 1000) for name, _, _, cumulative in rows), key=lambda row: -row[1]),
+        "deferred_loaded": [module for module in DEFERRED_MODULES if module in loaded],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start import time per module.")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per target")
+    parser.add_argument("--top", type=int, default=12, help="heaviest imports to list per target")
+    parser.add_argument("--with-openai", action="store_true", help="set OPENAI_API_KEY as a deployment with the LLM would")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with these results")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="wall-time ratio above which a target counts as regressed")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit non-zero on a regression or an eager deferred import")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    env.pop("OPENAI_API_KEY", None)
+    if args.with_openai:
+        env["OPENAI_API_KEY"] = "startup-measurement"
+
+    exclude = interpreter_modules(env)
+    results: Dict[str, Dict[str, object]] = {}
+    for target, statement in _targets().items():
+        stats = results[target] = measure(statement, max(1, args.repeat), env, exclude)
+        print(f"{target}: {stats['wall_ms']:.1f} ms, {stats['modules']} modules")
+        for name, cumulative in stats["heaviest"][: args.top]:
+            print(f"    {cumulative:>9.1f} ms  {name}")
+        if stats["deferred_loaded"]:
+            print(f"    eagerly imported: {', '.join(stats['deferred_loaded'])}")
+        stats["heaviest"] = stats["heaviest"][: args.top]
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+            handle.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    failed = any(stats["deferred_loaded"] for stats in results.values())
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        print()
+        for target, stats in results.items():
+            reference = baseline.get(target)
+            if not reference:
+                continue
+            ratio = stats["wall_ms"] / reference["wall_ms"] if reference["wall_ms"] else 1.0
+            flag = "  REGRESSION" if ratio > args.tolerance else ""
+            failed = failed or bool(flag)
+            print(f"{target:<16} {ratio:>6.2f}x baseline{flag}")
+    return 1 if failed and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+
+from report_engine import EventInput, build_mock_report
+
+FIELD_PATTERNS = {
+    "name": re.compile(r"^Event Headline:\s*(.*)$", re.MULTILINE),
+    "expected_timing": re.compile(r"^Expected Timing:\s*(.*)$", re.MULTILINE),
+    "description": re.compile(r"^Narrative Summary:\s*(.*)$", re.MULTILINE),
+}
+DRIVER_PATTERN = re.compile(r"^- (.*)$", re.MULTILINE)
+SCHEMA_KEY_PATTERN = re.compile(r'^\s*"(\w+)":', re.MULTILINE)
+SECTORS_PATTERN = re.compile(r"^Only include opportunities in these sectors and asset classes: (.*)\.$", re.MULTILINE)
+
+
+class StubConfig:
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        chunk_delay_ms: float = 0.0,
+        token_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        truncate_rate: float = 0.0,
+        fenced: bool = True,
+        replay: Optional[List[str]] = None,
+        record_path: Optional[str] = None,
+        upstream: Optional[str] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.chunk_delay_ms = chunk_delay_ms
+        self.token_ms = token_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.truncate_rate = truncate_rate
+        self.fenced = fenced
+        self.replay = itertools.cycle(replay) if replay else None
+        self.record_path = record_path
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+
+def load_recordings(path: str) -> List[str]:
+    # Accepts full chat completion objects or {"content": "..."} lines.
+    contents: List[str] = []
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "choices" in record:
+                contents.append(record["choices"][0]["message"]["content"])
+            else:
+                contents.append(record["content"])
+    return contents
+
+
+def _event_from_messages(messages: List[Dict[str, str]]) -> EventInput:
+    text = next((message["content"] for message in reversed(messages) if message.get("role") == "user"), "")
+    fields = {}
+    for field, pattern in FIELD_PATTERNS.items():
+        match = pattern.search(text)
+        fields[field] = match.group(1).strip() if match else ""
+    return EventInput(key_drivers=DRIVER_PATTERN.findall(text), **fields)
+
+
+def _restrict(report: Dict[str, object], system: str) -> Dict[str, object]:
+    # Partial prompts (llm_client.update_report, sharded generation) render a
+    # cut-down schema; answer only its keys, and only the requested sectors.
+    keys = set(SCHEMA_KEY_PATTERN.findall(system))
+    if not keys:
+        return report
+    report = {key: value for key, value in report.items() if key in keys}
+    if isinstance(report.get("market_impact"), dict):
+        report["market_impact"] = {key: value for key, value in report["market_impact"].items() if key in keys}
+    match = SECTORS_PATTERN.search(system)
+    if match and "opportunities" in report:
+        sectors = {sector.strip() for sector in match.group(1).split(",")}
+        report["opportunities"] = [item for item in report["opportunities"] if item["sector"] in sectors]
+    return report
+
+
+def synthetic_content(messages: List[Dict[str, str]], fenced: bool = True) -> str:
+    report = build_mock_report(_event_from_messages(messages))
+    report.pop("generated_at", None)
+    report.pop("event_name", None)
+    system = next((message["content"] for message in messages if message.get("role") == "system"), "")
+    report = _restrict(report, system)
+    body = json.dumps(report, ensure_ascii=False, indent=2)
+    return f"```json\n{body}\n```" if fenced else body
+
+
+def _usage(content: str, prompt_tokens: int) -> Dict[str, int]:
+    completion_tokens = max(1, len(content) // 4)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _completion(content: str, model: str, prompt_tokens: int) -> Dict[str, object]:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+        ],
+        "usage": _usage(content, prompt_tokens),
+    }
+
+
+def _stream_events(
+    content: str, model: str, usage: Optional[Dict[str, int]] = None, chunk_size: int = 24
+) -> Iterator[Dict[str, object]]:
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+    base = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model}
+    yield {**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]}
+    for start in range(0, len(content), chunk_size):
+        delta = {"content": content[start:start + chunk_size]}
+        yield {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+    yield {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+    if usage is not None:
+        yield {**base, "choices": [], "usage": usage}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    config: StubConfig = StubConfig()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, object]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _record(self, request: Dict[str, object]) -> str:
+        config = self.config
+        upstream_request = dict(request, stream=False)
+        upstream_request.pop("stream_options", None)
+        outgoing = urllib.request.Request(
+            f"{config.upstream}/chat/completions",
+            data=json.dumps(upstream_request).encode("utf-8"),
+            headers={"Content-Type": "application/json", "Authorization": self.headers.get("Authorization", "")},
+        )
+        with urllib.request.urlopen(outgoing) as response:
+            completion = json.loads(response.read())
+        with config.lock, open(config.record_path, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(completion, ensure_ascii=False) + "\n")
+        return completion["choices"][0]["message"]["content"]
+
+    def _content(self, request: Dict[str, object]) -> str:
+        config = self.config
+        if config.upstream and config.record_path:
+            return self._record(request)
+        if config.replay is not None:
+            with config.lock:
+                return next(config.replay)
+        return synthetic_content(request.get("messages", []), config.fenced)
+
+    def do_POST(self) -> None:
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+            return
+
+        length = int(self.headers.get("Content-Length", "0"))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        config = self.config
+        with config.lock:
+            delay = max(0.0, config.latency_ms + config.random.uniform(-config.jitter_ms, config.jitter_ms)) / 1000
+            fail = config.random.random() < config.error_rate
+            truncate = config.random.random() < config.truncate_rate
+            cut = config.random.random()
+        time.sleep(delay)
+
+        if fail:
+            self._send_json(
+                config.error_status,
+                {"error": {"message": "Injected upstream failure", "type": "server_error", "code": config.error_status}},
+            )
+            return
+
+        content = self._content(request)
+        if truncate:
+            content = content[: int(len(content) * cut)]
+        model = str(request.get("model", "stub"))
+        prompt_tokens = sum(len(str(message.get("content", ""))) for message in request.get("messages", [])) // 4
+
+        if not request.get("stream"):
+            # Models emit tokens one at a time, so a longer answer takes longer.
+            if config.token_ms:
+                time.sleep(_usage(content, prompt_tokens)["completion_tokens"] * config.token_ms / 1000)
+            self._send_json(200, _completion(content, model, prompt_tokens))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        include_usage = (request.get("stream_options") or {}).get("include_usage")
+        usage = _usage(content, prompt_tokens) if include_usage else None
+        for event in _stream_events(content, model, usage):
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            if config.chunk_delay_ms:
+                time.sleep(config.chunk_delay_ms / 1000)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def serve(config: StubConfig, host: str = "127.0.0.1", port: int = 8799) -> ThreadingHTTPServer:
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible chat completions stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="mean added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform +/- jitter around the mean latency")
+    parser.add_argument("--chunk-delay-ms", type=float, default=0.0, help="delay between streamed chunks")
+    parser.add_argument("--token-ms", type=float, default=0.0, help="delay per completion token for non-streamed responses")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status used for injected errors")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="fraction of responses cut off mid-JSON")
+    parser.add_argument("--unfenced", action="store_true", help="omit the ```json fence around synthetic reports")
+    parser.add_argument("--replay", help="JSONL of recorded completions to cycle through")
+    parser.add_argument("--record", help="append upstream completions to this JSONL file (requires --upstream)")
+    parser.add_argument("--upstream", help="real API base URL to proxy to when recording")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if args.record and not args.upstream:
+        parser.error("--record requires --upstream")
+
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        chunk_delay_ms=args.chunk_delay_ms,
+        token_ms=args.token_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        truncate_rate=args.truncate_rate,
+        fenced=not args.unfenced,
+        replay=load_recordings(args.replay) if args.replay else None,
+        record_path=args.record,
+        upstream=args.upstream,
+        seed=args.seed,
+    )
+    server = serve(config, args.host, args.port)
+    print(f"Stub OpenAI server on http://{args.host}:{server.server_address[1]}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
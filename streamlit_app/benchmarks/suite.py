@@ -0,0 +1,247 @@
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.stats import percentile
+from llm_client import _ensure_structure, _extract_json, _normalise_opportunities
+from prompt_parser import iter_events, parse_prompt
+from report_engine import BASE_OPPORTUNITIES, EventInput, build_mock_report, build_opportunities, fill_template
+from report_export import write_csv_stream
+from report_formatter import format_report_as_markdown
+from universe import OpportunityUniverse
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+Workload = Callable[[], object]
+
+
+@dataclass
+class Case:
+    name: str
+    size: int
+    setup: Callable[[int], Workload]
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+
+def _event(driver_count: int) -> EventInput:
+    return EventInput(
+        name="India expands semiconductor incentive programme",
+        expected_timing="Cabinet approval expected Q1 2025",
+        description="Delhi accelerates chip sovereignty push to attract global foundries and reduce supply chain risk.",
+        key_drivers=[f"driver {index}: subsidy pool and anchor fab commitments" for index in range(driver_count)],
+    )
+
+
+def _prompt(line_count: int) -> str:
+    lines = [
+        "Event: India expands semiconductor incentive programme",
+        "Timing: Cabinet approval expected Q1 2025",
+        "Drivers: $10B subsidy pool; anchor fabs from TSMC/Samsung; easing of import tariffs",
+    ]
+    lines.extend(f"- additional driver {index}, with supporting clause; and detail" for index in range(line_count // 2))
+    lines.append("")
+    lines.extend(f"Narrative line {index} on chip sovereignty and supply chain risk." for index in range(line_count // 2))
+    return "\n".join(lines)
+
+
+def _payload(opportunity_count: int) -> Dict[str, object]:
+    report = build_mock_report(_event(4))
+    opportunities = report["opportunities"]
+    report["opportunities"] = [
+        dict(opportunities[index % len(opportunities)], ticker=f"T{index}", time_horizon="medium")
+        for index in range(opportunity_count)
+    ]
+    return report
+
+
+def _llm_text(opportunity_count: int) -> str:
+    body = json.dumps(_payload(opportunity_count), indent=2, ensure_ascii=False)
+    return f"```json\n{body}\n```\nNotes: figures {{approximate}} as of the latest filing."
+
+
+def _universe(size: int) -> OpportunityUniverse:
+    records = []
+    for index in range(size):
+        record = dict(BASE_OPPORTUNITIES[index % len(BASE_OPPORTUNITIES)])
+        record["ticker"] = f"{record['ticker']}{index}"
+        records.append(record)
+    return OpportunityUniverse.from_records(records)
+
+
+def _setup_parse_prompt(size: int) -> Workload:
+    prompt = _prompt(size)
+    return lambda: parse_prompt(prompt)
+
+
+def _setup_iter_events(size: int) -> Workload:
+    document = "\n\n".join(_prompt(20).replace("Event: ", f"Event: {index}. ", 1) for index in range(size))
+    return lambda: sum(1 for _ in iter_events(document))
+
+
+def _setup_build_mock_report(size: int) -> Workload:
+    event_input = _event(size)
+    return lambda: build_mock_report(event_input)
+
+
+def _setup_build_opportunities(size: int) -> Workload:
+    universe = _universe(size)
+    return lambda: build_opportunities("Event", "drivers", "Q1 2025", "Bullish", universe=universe)
+
+
+def _setup_fill_template(size: int) -> Workload:
+    template = " ".join("{{event}} drives {{drivers}} through {{timing}}." for _ in range(size))
+    replacements = {"event": "Event", "drivers": "drivers", "timing": "Q1 2025"}
+    return lambda: fill_template(template, replacements)
+
+
+def _setup_extract_json(size: int) -> Workload:
+    text = _llm_text(size)
+    return lambda: _extract_json(text)
+
+
+def _setup_ensure_structure(size: int) -> Workload:
+    payload = _payload(size)
+    event_input = _event(4)
+    return lambda: _ensure_structure(payload, event_input)
+
+
+def _setup_normalise_opportunities(size: int) -> Workload:
+    opportunities = _payload(size)["opportunities"]
+    return lambda: _normalise_opportunities(opportunities)
+
+
+def _setup_format_markdown(size: int) -> Workload:
+    report = _payload(size)
+    return lambda: format_report_as_markdown(report)
+
+
+def _setup_export_csv(size: int) -> Workload:
+    reports = [_payload(20) for _ in range(size)]
+    return lambda: write_csv_stream(reports, io.StringIO())
+
+
+CASES: List[Case] = [
+    *(Case("parse_prompt", size, _setup_parse_prompt) for size in (4, 200, 5000)),
+    *(Case("iter_events", size, _setup_iter_events) for size in (10, 1000)),
+    *(Case("build_mock_report", size, _setup_build_mock_report) for size in (1, 10, 100)),
+    *(Case("build_opportunities", size, _setup_build_opportunities) for size in (27, 1000, 10000)),
+    *(Case("fill_template", size, _setup_fill_template) for size in (1, 50)),
+    *(Case("extract_json", size, _setup_extract_json) for size in (20, 200, 2000)),
+    *(Case("normalise_opportunities", size, _setup_normalise_opportunities) for size in (20, 200, 2000)),
+    *(Case("ensure_structure", size, _setup_ensure_structure) for size in (20, 200, 2000)),
+    *(Case("format_markdown", size, _setup_format_markdown) for size in (20, 200, 2000)),
+    *(Case("export_csv", size, _setup_export_csv) for size in (1, 100)),
+]
+
+
+def measure(workload: Workload, min_seconds: float, min_calls: int) -> Dict[str, float]:
+    workload()
+    latencies: List[float] = []
+    gc.collect()
+    started = time.perf_counter()
+    while len(latencies) < min_calls or time.perf_counter() - started < min_seconds:
+        call_started = time.perf_counter()
+        workload()
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    # Memory is traced on a separate call so tracing overhead does not skew latency.
+    tracemalloc.start()
+    workload()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "calls": len(latencies),
+        "throughput_per_s": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "peak_kib": peak / 1024,
+    }
+
+
+def run(cases: List[Case], min_seconds: float, min_calls: int) -> Dict[str, object]:
+    results: Dict[str, Dict[str, float]] = {}
+    for case in cases:
+        results[case.key] = measure(case.setup(case.size), min_seconds, min_calls)
+        stats = results[case.key]
+        print(
+            f"{case.key:<32} {stats['throughput_per_s']:>12.1f}/s "
+            f"p50 {stats['p50_ms']:>9.3f} ms  p95 {stats['p95_ms']:>9.3f} ms  "
+            f"p99 {stats['p99_ms']:>9.3f} ms  peak {stats['peak_kib']:>10.1f} KiB"
+        )
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], tolerance: float) -> List[str]:
+    regressions: List[str] = []
+    print()
+    print(f"{'case':<32} {'p50 ratio':>10} {'peak ratio':>11}")
+    for key, stats in current["results"].items():
+        reference = baseline.get("results", {}).get(key)
+        if not reference:
+            print(f"{key:<32} {'new':>10}")
+            continue
+        latency_ratio = stats["p50_ms"] / reference["p50_ms"] if reference["p50_ms"] else 1.0
+        memory_ratio = stats["peak_kib"] / reference["peak_kib"] if reference["peak_kib"] else 1.0
+        flag = ""
+        if latency_ratio > tolerance or memory_ratio > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(f"{key:<32} {latency_ratio:>9.2f}x {memory_ratio:>10.2f}x{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the report pipeline hot paths.")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="minimum wall time per case")
+    parser.add_argument("--min-calls", type=int, default=20, help="minimum calls per case")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with these results")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="ratio above which a case counts as regressed")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit non-zero when a case regresses")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in CASES if args.filter in case.key]
+    current = run(cases, args.min_seconds, args.min_calls)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(current, handle, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(current, handle, indent=2)
+            handle.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            regressions = compare(current, json.load(handle), args.tolerance)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
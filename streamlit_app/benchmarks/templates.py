@@ -0,0 +1,67 @@
+import argparse
+import re
+import timeit
+from typing import Dict, List
+
+from report_engine import BASE_OPPORTUNITIES
+from universe import OpportunityUniverse
+
+
+def _regex_fill(template: str, replacements: Dict[str, str]) -> str:
+    def _replace(match: re.Match[str]) -> str:
+        return replacements.get(match.group(1).strip(), "")
+
+    return re.sub(r"{{(.*?)}}", _replace, template)
+
+
+def _synthetic_universe(size: int) -> List[Dict[str, object]]:
+    universe = []
+    for index in range(size):
+        item = dict(BASE_OPPORTUNITIES[index % len(BASE_OPPORTUNITIES)])
+        item["ticker"] = f"{item['ticker']}{index}"
+        # Vary the text so the compile cache cannot collapse the universe.
+        item["mechanism_template"] = f"{item['mechanism_template']} [{index}]"
+        item["rationale_template"] = f"{item['rationale_template']} [{index}]"
+        universe.append(item)
+    return universe
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare regex template fills with precompiled templates.")
+    parser.add_argument("--size", type=int, default=5000, help="number of opportunities in the synthetic universe")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    universe = _synthetic_universe(args.size)
+    replacements = {
+        "event": "India expands semiconductor incentive programme",
+        "drivers": "$10B subsidy pool; anchor fabs; easing of import tariffs",
+        "timing": "Q1 2025",
+        "sentiment": "Bullish",
+    }
+
+    def run_regex() -> None:
+        for item in universe:
+            _regex_fill(item["mechanism_template"], replacements)
+            _regex_fill(item["rationale_template"], replacements)
+
+    compile_seconds = min(timeit.repeat(lambda: OpportunityUniverse.from_records(universe), number=1, repeat=1))
+    compiled = OpportunityUniverse.from_records(universe)
+
+    def run_compiled() -> None:
+        for mechanism, rationale in zip(compiled.mechanisms, compiled.rationales):
+            mechanism(replacements)
+            rationale(replacements)
+
+    regex_seconds = min(timeit.repeat(run_regex, number=1, repeat=args.repeat))
+    compiled_seconds = min(timeit.repeat(run_compiled, number=1, repeat=args.repeat))
+
+    print(f"universe size:      {args.size}")
+    print(f"universe build:     {compile_seconds * 1000:8.2f} ms")
+    print(f"regex fill:         {regex_seconds * 1000:8.2f} ms")
+    print(f"compiled fill:      {compiled_seconds * 1000:8.2f} ms")
+    print(f"speed-up:           {regex_seconds / compiled_seconds:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
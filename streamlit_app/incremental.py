@@ -0,0 +1,126 @@
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from report_engine import (
+    EVENT_FIELDS,
+    MOCK_SECTIONS,
+    OPPORTUNITY_UNIVERSE,
+    EventInput,
+    Section,
+    assemble_mock_report,
+    build_opportunities,
+    event_fields,
+)
+from sentiment import Sentiment
+from universe import PLACEHOLDER_PATTERN
+
+_UNSET = object()
+
+
+def dependents(sections: Sequence[Section]) -> Dict[str, List[str]]:
+    graph: Dict[str, List[str]] = {}
+    for section in sections:
+        for name in section.inputs:
+            graph.setdefault(name, []).append(section.name)
+    return graph
+
+
+def changed_fields(before: Optional[EventInput], after: EventInput) -> Set[str]:
+    if before is None:
+        return set(EVENT_FIELDS)
+    old, new = event_fields(before), event_fields(after)
+    return {field for field in EVENT_FIELDS if old[field] != new[field]}
+
+
+def affected_sections(fields: Iterable[str], sections: Sequence[Section] = MOCK_SECTIONS) -> Set[str]:
+    # Every section reachable from the changed fields, whether or not its value would end up changing.
+    graph = dependents(sections)
+    reached: Set[str] = set()
+    queue = deque(fields)
+    while queue:
+        for name in graph.get(queue.popleft(), ()):
+            if name not in reached:
+                reached.add(name)
+                queue.append(name)
+    return reached
+
+
+@lru_cache(maxsize=4096)
+def _placeholders(template: str) -> Tuple[str, ...]:
+    return tuple(sorted({key.strip() for key in PLACEHOLDER_PATTERN.findall(template)}))
+
+
+def _detach(report: Dict[str, object]) -> Dict[str, object]:
+    # Section values are kept for the next build, so the caller gets its own containers.
+    context = dict(report["event_context"])
+    context["context_points"] = list(context["context_points"])
+    impact = report["market_impact"]
+    report["event_context"] = context
+    report["market_impact"] = {
+        "sentiment": impact["sentiment"],
+        "macro_themes": list(impact["macro_themes"]),
+        "sector_outlook": list(impact["sector_outlook"]),
+        "horizon_impacts": [dict(row) for row in impact["horizon_impacts"]],
+    }
+    report["opportunities"] = [dict(item) for item in report["opportunities"]]
+    report["summary_insights"] = list(report["summary_insights"])
+    report["citations"] = list(report["citations"])
+    return report
+
+
+class IncrementalReportBuilder:
+    # Memoises every section of the mock report and, on the next build,
+    # recomputes only sections downstream of an edited field. A recomputed
+    # section whose value comes out unchanged stops the propagation there.
+    def __init__(self, sections: Sequence[Section] = MOCK_SECTIONS) -> None:
+        self.sections = tuple(sections)
+        self.recomputed: Tuple[str, ...] = ()
+        self.event_input: Optional[EventInput] = None
+        self._values: Dict[str, object] = {}
+        self._rows: Dict[Tuple[object, ...], Dict[str, object]] = {}
+        self._overrides: Dict[str, Callable[..., object]] = {"opportunities": self._opportunities}
+        universe = OPPORTUNITY_UNIVERSE
+        self._row_placeholders = tuple(
+            _placeholders(mechanism) + _placeholders(rationale)
+            for mechanism, rationale in zip(universe.mechanism_templates, universe.rationale_templates)
+        )
+
+    def _opportunities(
+        self, event_name: str, drivers_text: str, timeline: str, sentiment: Sentiment, ranked_rows: Sequence[int]
+    ) -> List[Dict[str, object]]:
+        # Rows are re-rendered only when a placeholder their own templates use has
+        # changed, so editing the timing leaves rows that never mention it alone.
+        replacements = {"event": event_name, "drivers": drivers_text, "timing": timeline, "sentiment": sentiment}
+        previous = self._rows
+        placeholders = self._row_placeholders
+        keys: List[Tuple[object, ...]] = []
+        missing: List[int] = []
+        for row in ranked_rows:
+            key = (row, *[replacements.get(name, "") for name in placeholders[row]])
+            keys.append(key)
+            if key not in previous:
+                missing.append(row)
+        rendered = iter(build_opportunities(event_name, drivers_text, timeline, sentiment, rows=missing))
+        rows = {key: previous[key] if key in previous else next(rendered) for key in keys}
+        self._rows = rows
+        return [rows[key] for key in keys]
+
+    def build(self, event_input: EventInput) -> Dict[str, object]:
+        fields = event_fields(event_input)
+        dirty = {name for name, value in fields.items() if self._values.get(name, _UNSET) != value}
+        self._values.update(fields)
+        recomputed: List[str] = []
+        for section in self.sections:
+            previous = self._values.get(section.name, _UNSET)
+            if previous is not _UNSET and dirty.isdisjoint(section.inputs):
+                continue
+            compute = self._overrides.get(section.name, section.compute)
+            value = compute(*[self._values[name] for name in section.inputs])
+            recomputed.append(section.name)
+            if value != previous:
+                self._values[section.name] = value
+                dirty.add(section.name)
+        self.recomputed = tuple(recomputed)
+        self.event_input = event_input
+        return _detach(assemble_mock_report(self._values))
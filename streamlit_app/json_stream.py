@@ -0,0 +1,189 @@
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+Section = Tuple[str, object]
+
+_WHITESPACE = " \t\r\n"
+_STRUCTURAL = re.compile(r'[{}"]')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+# Only a brace followed by a key or an immediate close can open a JSON object.
+_OBJECT_START = re.compile(r'\{\s*["}]')
+
+_DECODER = json.JSONDecoder()
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+loads = orjson.loads if orjson is not None else json.loads
+
+
+def _matching_brace(text: str, start: int) -> int:
+    # Jumps between structural characters with C-level regex searches and skips
+    # string literals whole, so braces inside strings never count.
+    depth = 0
+    position = start
+    while True:
+        match = _STRUCTURAL.search(text, position)
+        if match is None:
+            return -1
+        index = match.start()
+        char = text[index]
+        if char == '"':
+            string = _STRING.match(text, index)
+            if string is None:
+                return -1
+            position = string.end()
+            continue
+        depth += 1 if char == "{" else -1
+        if depth == 0:
+            return index
+        position = index + 1
+
+
+def find_json_object(text: str) -> Tuple[Optional[str], Optional[Dict[str, object]]]:
+    # Returns the first {...} span that decodes to an object, ignoring fences and
+    # prose around it. Spans that fail to decode are skipped as a whole, so the
+    # text is scanned once; an unbalanced span means the payload was truncated.
+    if not text:
+        return None, None
+    start = text.find("{")
+    if start == -1:
+        return None, None
+
+    end = text.rfind("}")
+    if orjson is not None and end > start:
+        # Common case: the object runs from the first "{" to the last "}".
+        try:
+            value = orjson.loads(text[start:end + 1])
+        except ValueError:
+            value = None
+        if isinstance(value, dict):
+            return text[start:end + 1], value
+
+    # Noise such as "{x}" is stepped over by the regex without calling the
+    # decoder, whose error path is linear in the offset of the failure.
+    position = start
+    while True:
+        match = _OBJECT_START.search(text, position)
+        if match is None:
+            return None, None
+        start = match.start()
+        try:
+            value, end = _DECODER.raw_decode(text, start)
+        except ValueError:
+            end = _matching_brace(text, start)
+            if end == -1:
+                return None, None
+            position = end + 1
+            continue
+        return text[start:end], value
+
+
+# Emits each top-level member as soon as its value is complete, and items of the
+# opportunities array one object at a time, scanning every character only once.
+class IncrementalReportParser:
+
+    def __init__(self, item_key: str = "opportunities") -> None:
+        self.item_key = item_key
+        self.values: Dict[str, object] = {}
+        self.complete = False
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._awaiting_value = False
+        self._value_start: Optional[int] = None
+        self._item_start: Optional[int] = None
+
+    def _emit(self, sections: List[Section], key: str, raw: str) -> None:
+        try:
+            value = loads(raw)
+        except ValueError:
+            return
+        self.values[key] = value
+        if key != self.item_key:
+            sections.append((key, value))
+
+    def _finish_value(self, sections: List[Section], end: int) -> None:
+        if self._key is not None and self._value_start is not None:
+            self._emit(sections, self._key, self._text[self._value_start:end].strip())
+        self._key = None
+        self._value_start = None
+
+    def feed(self, chunk: str) -> List[Section]:
+        sections: List[Section] = []
+        if self.complete or not chunk:
+            return sections
+        self._text += chunk
+        text = self._text
+
+        for index in range(self._pos, len(text)):
+            char = text[index]
+            depth = self._depth
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if depth == 1:
+                        if self._key_start is not None:
+                            try:
+                                self._key = loads(text[self._key_start:index + 1])
+                            except ValueError:
+                                self._key = None
+                            self._key_start = None
+                        elif self._value_start is not None:
+                            self._finish_value(sections, index + 1)
+                continue
+
+            if depth == 0:
+                # Skip fences or prose until the root object opens.
+                if char == "{":
+                    self._depth = 1
+                continue
+
+            if depth == 1 and self._awaiting_value and char not in _WHITESPACE:
+                self._awaiting_value = False
+                self._value_start = index
+
+            if char == '"':
+                self._in_string = True
+                if depth == 1 and self._value_start is None:
+                    self._key_start = index
+            elif char in "{[":
+                if depth == 2 and char == "{" and self._key == self.item_key:
+                    self._item_start = index
+                self._depth = depth + 1
+            elif char in "}]":
+                self._depth = depth - 1
+                if self._depth == 2 and self._item_start is not None:
+                    try:
+                        sections.append(("opportunity", loads(text[self._item_start:index + 1])))
+                    except ValueError:
+                        pass
+                    self._item_start = None
+                elif self._depth == 1:
+                    self._finish_value(sections, index + 1)
+                elif self._depth == 0:
+                    self._finish_value(sections, index)
+                    self.complete = True
+                    self._pos = index + 1
+                    return sections
+            elif depth == 1:
+                if char == ":":
+                    self._awaiting_value = True
+                elif char == ",":
+                    self._finish_value(sections, index)
+
+        self._pos = len(text)
+        return sections
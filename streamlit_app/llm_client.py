@@ -1,54 +1,102 @@
+import asyncio
+import copy
 import json
 import os
-import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Generator, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Type
 
-from openai import OpenAI
+from incremental import IncrementalReportBuilder, changed_fields
+from json_stream import IncrementalReportParser, Section, find_json_object
+from metrics import CACHE_LOOKUPS, FALLBACKS, JSON_FAILURES, SCHEMA_ISSUES, RequestTrace
+from report_cache import ReportCache, cache_key
+from report_engine import EVENT_FIELDS, EventInput, build_mock_report, build_mock_reports
+from report_history import ReportHistory
+from report_schema import (
+    OPPORTUNITY_VALIDATOR,
+    REPORT_SCHEMA,
+    REPORT_VALIDATOR,
+    SchemaIssue,
+    Validator,
+    render_schema,
+    subschema,
+)
+from resilience import CircuitBreaker, LatencyBudget, Resilience, RetryPolicy
 
-from report_engine import EventInput, build_mock_report
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
 
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 OPENAI_ENABLED = bool(os.getenv("OPENAI_API_KEY"))
+# Point at any OpenAI-compatible endpoint, e.g. the local stub in benchmarks/stub_server.py.
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+OPENAI_BATCH_WORKERS = int(os.getenv("OPENAI_BATCH_WORKERS", "4"))
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "8"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_STREAM = os.getenv("OPENAI_STREAM", "1") != "0"
+# Edits to the current event regenerate only the report sections they affect.
+OPENAI_TARGETED_UPDATES = os.getenv("OPENAI_TARGETED_UPDATES", "1") != "0"
+OPENAI_SECTION_MAX_TOKENS = int(os.getenv("OPENAI_SECTION_MAX_TOKENS", "1200"))
+# 0 asks for the whole report in one completion. N > 0 runs one call for the
+# narrative and N concurrent calls for the opportunity table, each covering a
+# slice of OPPORTUNITY_SECTORS, so latency follows the longest of them.
+OPENAI_OPPORTUNITY_SHARDS = int(os.getenv("OPENAI_OPPORTUNITY_SHARDS", "0"))
 
-SYSTEM_PROMPT = """You are an institutional research analyst.
+MOCK_NOTE = "OpenAI disabled; using rule-based template."
+
+# End-to-end budget per report: retries, hedges and backoff all fit inside it.
+OPENAI_LATENCY_BUDGET = float(os.getenv("OPENAI_LATENCY_BUDGET", str(OPENAI_TIMEOUT)))
+OPENAI_ATTEMPT_TIMEOUT = float(os.getenv("OPENAI_ATTEMPT_TIMEOUT", "0")) or None
+OPENAI_HEDGE_PERCENTILE = float(os.getenv("OPENAI_HEDGE_PERCENTILE", "0"))
+
+
+def _retryable_errors() -> Tuple[Type[BaseException], ...]:
+    from openai import APIConnectionError, InternalServerError, RateLimitError
+
+    return APIConnectionError, InternalServerError, RateLimitError
+
+
+RESILIENCE = Resilience(
+    budget_seconds=OPENAI_LATENCY_BUDGET,
+    retry=RetryPolicy(
+        attempts=int(os.getenv("OPENAI_RETRY_ATTEMPTS", "3")),
+        base_delay=float(os.getenv("OPENAI_RETRY_BASE_DELAY", "0.5")),
+        max_delay=float(os.getenv("OPENAI_RETRY_MAX_DELAY", "4")),
+    ),
+    breaker=CircuitBreaker(
+        failure_threshold=int(os.getenv("OPENAI_BREAKER_FAILURES", "5")),
+        reset_seconds=float(os.getenv("OPENAI_BREAKER_RESET", "30")),
+    ),
+    retryable=_retryable_errors,
+    attempt_seconds=OPENAI_ATTEMPT_TIMEOUT,
+    hedge_percentile=OPENAI_HEDGE_PERCENTILE,
+    max_workers=OPENAI_CONCURRENCY * 2,
+)
+
+# Bump whenever SYSTEM_PROMPT or USER_TEMPLATE change so cached reports are not reused.
+PROMPT_VERSION = "1"
+
+REPORT_CACHE_DIR = os.getenv(
+    "REPORT_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".report_cache")
+)
+REPORT_CACHE = ReportCache(
+    directory=REPORT_CACHE_DIR or None,
+    max_entries=int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "256")),
+    max_disk_entries=int(os.getenv("REPORT_CACHE_MAX_DISK_ENTRIES", "5000")),
+    ttl_seconds=float(os.getenv("REPORT_CACHE_TTL", "86400")),
+)
+
+# Every finished report is appended here; an empty path disables the history.
+REPORT_HISTORY_PATH = os.getenv(
+    "REPORT_HISTORY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".report_history.sqlite3")
+)
+REPORT_HISTORY = ReportHistory(REPORT_HISTORY_PATH or None)
+
+SYSTEM_PROMPT = f"""You are an institutional research analyst.
 Return ONLY valid JSON that matches this schema:
-{
-  "headline_summary": string,
-  "event_context": {
-    "overview": string,
-    "timing": string,
-    "significance": string,
-    "context_points": string[1..4]
-  },
-  "market_impact": {
-    "sentiment": "Bullish"|"Bearish"|"Neutral",
-    "macro_themes": string[1..6],
-    "sector_outlook": string[1..5],
-    "horizon_impacts": [
-      {"horizon": "Short-term (0–3 months)", "outlook": string},
-      {"horizon": "Medium-term (3–12 months)", "outlook": string},
-      {"horizon": "Long-term (1–5 years)", "outlook": string}
-    ]
-  },
-  "opportunities": [
-    {
-      "ticker": string,
-      "company": string,
-      "sector": string,
-      "country": string,
-      "expected_direction": "Bullish"|"Bearish"|"Neutral",
-      "time_horizon": "Short-term (0–3 months)"|"Medium-term (3–12 months)"|"Long-term (1–5 years)",
-      "mechanism": string,
-      "investability_score": number (1-10),
-      "rationale": string,
-      "sources": string[]
-    }
-  ],
-  "summary_insights": string[1..5],
-  "risk_note": string,
-  "citations": string[3]
-}
+{render_schema(REPORT_SCHEMA)}
 Ensure there are at least 20 opportunities covering multiple sectors (global equities, ETFs, commodities, fixed income, crypto, etc.).
 """
 
@@ -60,125 +108,751 @@ Key Drivers:
 
 Produce concise, evidence-based language. Cite reputable public sources only."""
 
+SECTION_SYSTEM_PROMPT = """You are an institutional research analyst revising part of an existing report after its event was edited.
+Return ONLY valid JSON that matches this schema:
+{schema}
+{extra}"""
+
+MIN_OPPORTUNITIES = 20
+# Completion tokens one opportunity row takes, with room to spare.
+OPPORTUNITY_TOKENS = 175
+# The same for one column of a row rewritten in place, with its ticker.
+OPPORTUNITY_FIELD_TOKENS = 40
+OPPORTUNITY_SECTORS = (
+    "Technology",
+    "Emerging Tech / AI",
+    "Communication Services",
+    "Industrials",
+    "Defense",
+    "Materials",
+    "Energy",
+    "Utilities",
+    "Healthcare",
+    "Consumer Goods",
+    "Financials",
+    "Real Estate",
+    "Broad-market and thematic ETFs",
+    "Commodities",
+    "Fixed Income",
+    "Currencies",
+    "Crypto",
+)
+
+PART_SYSTEM_PROMPT = """You are an institutional research analyst drafting one part of a report.
+Return ONLY valid JSON that matches this schema:
+{schema}
+{extra}"""
+
+SHARD_INSTRUCTIONS = """Only include opportunities in these sectors and asset classes: {sectors}.
+Provide at least {count} opportunities, each with a distinct ticker.
+"""
+
+NARRATIVE_FIELDS = tuple(name for name in REPORT_SCHEMA.fields if name != "opportunities")
+
+# The report text that restates each event field, which is all an edit of that
+# field regenerates. "opportunities.<column>" rewrites one column of every row
+# in place; the rows themselves are only redone by a full generation.
+EDIT_FIELDS = {
+    "name": ("headline_summary", "event_context.overview"),
+    "expected_timing": ("event_context.timing", "opportunities.time_horizon"),
+    "description": (
+        "headline_summary",
+        "event_context.overview",
+        "event_context.significance",
+        "event_context.context_points",
+        "summary_insights",
+        "citations",
+    ),
+    "key_drivers": (
+        "event_context.context_points",
+        "market_impact.sentiment",
+        "market_impact.macro_themes",
+        "market_impact.sector_outlook",
+        "summary_insights",
+    ),
+}
+
 
 def _extract_json(raw_text: str) -> Optional[str]:
-    if not raw_text:
-        return None
-    text = raw_text.strip()
-    if text.startswith("```"):
-        text = re.sub(r"^```json\s*", "", text)
-        text = re.sub(r"^```\s*", "", text)
-        text = text.strip("`")
-    match = re.search(r"\{.*\}", text, re.DOTALL)
-    return match.group(0) if match else None
+    return find_json_object(raw_text)[0]
 
 
 def _normalise_opportunities(data: List[Dict[str, object]]) -> List[Dict[str, object]]:
-    horizons = {"short": "Short-term (0–3 months)", "medium": "Medium-term (3–12 months)", "long": "Long-term (1–5 years)"}
-    results = []
-    for item in data:
-        entry = {
-            "ticker": str(item.get("ticker", "")).upper(),
-            "company": item.get("company", ""),
-            "sector": item.get("sector", ""),
-            "country": item.get("country", ""),
-            "expected_direction": item.get("expected_direction", "Neutral"),
-            "time_horizon": item.get("time_horizon", "Medium-term (3–12 months)"),
-            "mechanism": item.get("mechanism", ""),
-            "investability_score": item.get("investability_score", 5),
-            "rationale": item.get("rationale", ""),
-            "sources": item.get("sources", []),
-        }
-        horizon_lower = entry["time_horizon"].lower()
-        for key, label in horizons.items():
-            if key in horizon_lower:
-                entry["time_horizon"] = label
-                break
-        results.append(entry)
-    return results
+    return OPPORTUNITY_VALIDATOR.validate_items(data)[0]
 
 
-def _ensure_structure(raw: Dict[str, object], event_input: EventInput) -> Dict[str, object]:
+def _validate_report(
+    raw: Dict[str, object], event_input: EventInput
+) -> Tuple[Dict[str, object], List[SchemaIssue]]:
+    body, issues = REPORT_VALIDATOR.validate(raw)
+    context = body["event_context"]
+    if not context["timing"]:
+        context["timing"] = event_input.expected_timing
     report = {
         "generated_at": datetime.utcnow().isoformat(),
-        "event_name": event_input.name or raw.get("event_context", {}).get("overview", "Strategic Market Catalyst"),
-        "headline_summary": raw.get("headline_summary", ""),
-        "event_context": {
-            "overview": raw.get("event_context", {}).get("overview", ""),
-            "timing": raw.get("event_context", {}).get("timing", event_input.expected_timing),
-            "significance": raw.get("event_context", {}).get("significance", ""),
-            "context_points": raw.get("event_context", {}).get("context_points", [])[:4],
-        },
-        "market_impact": raw.get("market_impact", {}),
-        "opportunities": _normalise_opportunities(raw.get("opportunities", [])),
-        "summary_insights": raw.get("summary_insights", []),
-        "risk_note": raw.get("risk_note", ""),
-        "citations": raw.get("citations", []),
+        "event_name": event_input.name or context["overview"] or "Strategic Market Catalyst",
+        **body,
     }
+    return report, issues
 
-    # Ensure horizon ordering
-    desired_order = [
-        "Short-term (0–3 months)",
-        "Medium-term (3–12 months)",
-        "Long-term (1–5 years)",
-    ]
-    existing = {item.get("horizon"): item.get("outlook") for item in report["market_impact"].get("horizon_impacts", [])}
-    report["market_impact"]["horizon_impacts"] = [
-        {"horizon": horizon, "outlook": existing.get(horizon, "")} for horizon in desired_order
-    ]
-
-    return report
 
+def _ensure_structure(raw: Dict[str, object], event_input: EventInput) -> Dict[str, object]:
+    return _validate_report(raw, event_input)[0]
 
-def _call_openai(event_input: EventInput) -> Tuple[Optional[Dict[str, object]], Optional[str]]:
-    if not OPENAI_ENABLED:
-        return None, "OpenAI API key not configured."
-
-    client = OpenAI(
-        api_key=os.environ["OPENAI_API_KEY"],
-    )
 
+def _user_message(event_input: EventInput) -> str:
     drivers = event_input.key_drivers or ["Driver details not specified"]
     driver_block = "\n".join(f"- {driver}" for driver in drivers)
-    user_message = USER_TEMPLATE.format(
+    return USER_TEMPLATE.format(
         name=event_input.name or "Unnamed Event",
         timing=event_input.expected_timing or "Timing TBD",
         description=event_input.description or "No narrative provided.",
         drivers=driver_block,
     )
 
-    response = client.chat.completions.create(
-        model=OPENAI_MODEL,
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_message},
-        ],
-        temperature=0.35,
-        max_tokens=3500,
-    )
 
-    content = response.choices[0].message.content
-    payload = _extract_json(content)
-    if not payload:
+def _build_messages(event_input: EventInput) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": _user_message(event_input)},
+    ]
+
+
+def _parse_completion(
+    content: Optional[str], event_input: EventInput, trace: Optional[RequestTrace] = None
+) -> Dict[str, object]:
+    trace = trace or RequestTrace()
+    # Extraction decodes the payload as it validates it, so there is no separate json.loads stage.
+    with trace.stage("extract_json"):
+        _, data = find_json_object(content or "")
+    if data is None:
+        JSON_FAILURES.inc(reason="missing" if "{" not in (content or "") else "decode")
         raise ValueError("LLM response did not contain valid JSON.")
-    data = json.loads(payload)
-    return _ensure_structure(data, event_input), None
+    with trace.stage("ensure_structure"):
+        report, issues = _validate_report(data, event_input)
+    _record_issues(issues, trace)
+    return report
 
 
-def generate_report(event_input: EventInput) -> Tuple[Dict[str, object], str]:
-    if not OPENAI_ENABLED:
+def _record_issues(issues: List[SchemaIssue], trace: RequestTrace) -> None:
+    if issues:
+        codes = Counter(issue.code for issue in issues)
+        for code, count in codes.items():
+            SCHEMA_ISSUES.inc(count, code=code)
+        trace.event("schema_issues:" + ",".join(f"{code}={count}" for code, count in sorted(codes.items())))
+
+
+def _finish(
+    report: Dict[str, object], note: str, trace: RequestTrace, outcome: str
+) -> Tuple[Dict[str, object], str]:
+    # Saved before the trace is attached; cache hits match an existing row and are skipped.
+    with trace.stage("history_save"):
+        REPORT_HISTORY.add(report, outcome)
+    report["metadata"] = {"trace": trace.finish(outcome)}
+    return report, note
+
+
+def _mock_report(event_input: EventInput, trace: RequestTrace) -> Tuple[Dict[str, object], str]:
+    with trace.stage("mock_report"):
         report = build_mock_report(event_input)
-        return report, "OpenAI disabled; using rule-based template."
+    return _finish(report, MOCK_NOTE, trace, "mock")
+
+
+def _fallback_report(
+    event_input: EventInput, exc: Exception, trace: Optional[RequestTrace] = None
+) -> Tuple[Dict[str, object], str]:
+    trace = trace or RequestTrace()
+    FALLBACKS.inc(reason=type(exc).__name__)
+    trace.event(f"fallback:{type(exc).__name__}")
+    with trace.stage("mock_report"):
+        fallback = build_mock_report(event_input)
+    fallback["summary_insights"].append(
+        "LLM generation unavailable—displaying deterministic template output for review."
+    )
+    note = f"OpenAI request failed ({exc}); reverted to rule-based template."
+    return _finish(fallback, note, trace, "fallback")
+
+
+def _cache_key(event_input: EventInput) -> str:
+    return cache_key(event_input, OPENAI_MODEL, PROMPT_VERSION)
+
+
+def _cached_report(key: str, trace: Optional[RequestTrace] = None) -> Optional[Tuple[Dict[str, object], str]]:
+    trace = trace or RequestTrace()
+    with trace.stage("cache_lookup"):
+        cached = REPORT_CACHE.get(key)
+    if cached is None:
+        CACHE_LOOKUPS.inc(result="miss")
+        return None
+    CACHE_LOOKUPS.inc(result="hit")
+    trace.event("cache_hit")
+    note = f"OpenAI ({OPENAI_MODEL}) response served from cache (generated {cached['generated_at']})."
+    return _finish(cached, note, trace, "cache")
+
+
+# The SDK takes most of a second to import, so it is loaded on the first call
+# and never when OPENAI_ENABLED is false. The sync client is thread-safe and
+# shared so its connection pool is reused. SDK retries are off: RESILIENCE
+# retries inside the latency budget instead.
+@lru_cache(maxsize=1)
+def _client() -> "OpenAI":
+    from openai import OpenAI
+
+    return OpenAI(api_key=os.environ["OPENAI_API_KEY"], base_url=OPENAI_BASE_URL, max_retries=0)
+
+
+# Async clients are bound to the running event loop, so each batch builds its own.
+def _async_client() -> "AsyncOpenAI":
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(api_key=os.environ["OPENAI_API_KEY"], base_url=OPENAI_BASE_URL, max_retries=0)
+
+
+def _call_openai(
+    event_input: EventInput, trace: Optional[RequestTrace] = None, budget: Optional[LatencyBudget] = None
+) -> Tuple[Optional[Dict[str, object]], Optional[str]]:
+    if not OPENAI_ENABLED:
+        return None, "OpenAI API key not configured."
+
+    trace = trace or RequestTrace()
+    client = _client()
+    messages = _build_messages(event_input)
+
+    def request(timeout: float):
+        return client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=messages,
+            temperature=0.35,
+            max_tokens=3500,
+            timeout=timeout,
+        )
+
+    with trace.stage("llm_call"):
+        response = RESILIENCE.call(request, budget, trace=trace)
+    trace.record_usage(response.usage)
+
+    return _parse_completion(response.choices[0].message.content, event_input, trace), None
+
+
+def generate_report(event_input: EventInput, trace: Optional[RequestTrace] = None) -> Tuple[Dict[str, object], str]:
+    trace = trace or RequestTrace()
+    if not OPENAI_ENABLED:
+        return _mock_report(event_input, trace)
+
+    budget = RESILIENCE.budget()
+    key = _cache_key(event_input)
+    cached = _cached_report(key, trace)
+    if cached:
+        return cached
 
     try:
-        report, error = _call_openai(event_input)
+        if OPENAI_OPPORTUNITY_SHARDS > 0:
+            report, complete = _call_openai_sharded(event_input, trace, budget)
+            error = None
+        else:
+            report, error = _call_openai(event_input, trace, budget)
+            complete = True
         if report:
-            return report, f"OpenAI ({OPENAI_MODEL}) response."
+            # A report missing failed shards is shown but not cached, so the next request retries them.
+            if complete:
+                REPORT_CACHE.put(key, report)
+            return _finish(report, f"OpenAI ({OPENAI_MODEL}) response.", trace, "openai")
         raise RuntimeError(error or "Unknown OpenAI error.")
     except Exception as exc:
-        fallback = build_mock_report(event_input)
-        fallback["summary_insights"].append(
-            "LLM generation unavailable—displaying deterministic template output for review."
+        return _fallback_report(event_input, exc, trace)
+
+
+def opportunity_shards(count: int) -> List[Tuple[str, ...]]:
+    # Interleaved so each shard mixes equities with other asset classes.
+    count = max(1, min(count, len(OPPORTUNITY_SECTORS)))
+    return [OPPORTUNITY_SECTORS[index::count] for index in range(count)]
+
+
+def _dedupe_opportunities(
+    rows: Iterable[Dict[str, object]], seen: Optional[Set[str]] = None
+) -> List[Dict[str, object]]:
+    # Shards can overlap at the edges of their sectors; the first row for a ticker wins.
+    seen = set() if seen is None else seen
+    unique: List[Dict[str, object]] = []
+    for row in rows:
+        ticker = row["ticker"]
+        if ticker and ticker not in seen:
+            seen.add(ticker)
+            unique.append(row)
+    return unique
+
+
+def _decode_part(content: Optional[str]) -> Dict[str, object]:
+    _, data = find_json_object(content or "")
+    if not isinstance(data, dict):
+        JSON_FAILURES.inc(reason="missing" if "{" not in (content or "") else "decode")
+        raise ValueError("LLM response did not contain valid JSON.")
+    return data
+
+
+def _request_part(
+    messages: List[Dict[str, str]], max_tokens: int, trace: RequestTrace, budget: Optional[LatencyBudget]
+) -> Tuple[object, Optional[str]]:
+    # Runs on a shard thread, so usage goes back to the caller rather than into the shared trace.
+    client = _client()
+
+    def request(timeout: float):
+        return client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=messages,
+            temperature=0.35,
+            max_tokens=max_tokens,
+            timeout=timeout,
         )
-        note = f"OpenAI request failed ({exc}); reverted to rule-based template."
-        return fallback, note
+
+    # The shard thread makes the request itself: nested in the shared pool,
+    # shards from concurrent reports would queue behind each other.
+    response = RESILIENCE.call(request, budget, trace=trace, inline=True)
+    return response.usage, response.choices[0].message.content
+
+
+def _sharded_parts(
+    event_input: EventInput, trace: RequestTrace, budget: Optional[LatencyBudget] = None
+) -> Iterator[Tuple[int, Dict[str, object]]]:
+    # Yields (part, decoded JSON) as calls finish: part -1 is the narrative,
+    # 0.. the opportunity shards. A failed shard is skipped; a failed
+    # narrative fails the report.
+    shards = opportunity_shards(OPENAI_OPPORTUNITY_SHARDS)
+    per_shard = -(-MIN_OPPORTUNITIES // len(shards))
+    user_message = _user_message(event_input)
+    parts = {-1: (NARRATIVE_FIELDS, "", OPENAI_SECTION_MAX_TOKENS)}
+    for index, sectors in enumerate(shards):
+        extra = SHARD_INSTRUCTIONS.format(sectors=", ".join(sectors), count=per_shard)
+        parts[index] = (("opportunities",), extra, OPPORTUNITY_TOKENS * (per_shard + 2))
+    pool = ThreadPoolExecutor(max_workers=len(parts), thread_name_prefix="llm-shard")
+    try:
+        futures = {}
+        for part, (fields, extra, max_tokens) in parts.items():
+            schema = render_schema(_section_validator(fields).schema)
+            messages = [
+                {"role": "system", "content": PART_SYSTEM_PROMPT.format(schema=schema, extra=extra)},
+                {"role": "user", "content": user_message},
+            ]
+            futures[pool.submit(_request_part, messages, max_tokens, trace, budget)] = part
+        for future in as_completed(futures):
+            part = futures[future]
+            try:
+                usage, content = future.result()
+                trace.record_usage(usage)
+                data = _decode_part(content)
+            except Exception as exc:
+                if part < 0:
+                    raise
+                trace.event(f"shard_failed:{part}:{type(exc).__name__}")
+                continue
+            yield part, data
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _merge_shards(
+    narrative: Optional[Dict[str, object]],
+    shard_rows: Dict[int, List[Dict[str, object]]],
+    event_input: EventInput,
+    trace: RequestTrace,
+) -> Tuple[Dict[str, object], bool]:
+    # The report and whether every shard contributed to it.
+    if narrative is None:
+        raise ValueError("LLM response did not contain the report narrative.")
+    # Shard order, not arrival order, so the table is stable across runs.
+    rows = [row for part in sorted(shard_rows) for row in shard_rows[part]]
+    opportunities = _dedupe_opportunities(_normalise_opportunities(rows))
+    if not opportunities:
+        raise ValueError("No opportunity shard returned usable rows.")
+    with trace.stage("ensure_structure"):
+        report, issues = _validate_report({**narrative, "opportunities": opportunities}, event_input)
+    _record_issues(issues, trace)
+    shards = opportunity_shards(OPENAI_OPPORTUNITY_SHARDS)
+    trace.event(f"shards:{len(shard_rows)}/{len(shards)}")
+    missing = [sector for part, sectors in enumerate(shards) if part not in shard_rows for sector in sectors]
+    if missing:
+        report["summary_insights"].append(f"Opportunity coverage excludes {', '.join(missing)} after failed requests.")
+    return report, not missing
+
+
+def _shard_rows(data: Dict[str, object]) -> List[object]:
+    rows = data.get("opportunities")
+    return rows if isinstance(rows, list) else []
+
+
+def _call_openai_sharded(
+    event_input: EventInput, trace: RequestTrace, budget: Optional[LatencyBudget] = None
+) -> Tuple[Dict[str, object], bool]:
+    narrative: Optional[Dict[str, object]] = None
+    shard_rows: Dict[int, List[Dict[str, object]]] = {}
+    with trace.stage("llm_call"):
+        for part, data in _sharded_parts(event_input, trace, budget):
+            if part < 0:
+                narrative = data
+            else:
+                shard_rows[part] = _shard_rows(data)
+    return _merge_shards(narrative, shard_rows, event_input, trace)
+
+
+def targeted_base(report: Optional[Dict[str, object]]) -> bool:
+    # Only a report the LLM wrote can take LLM sections; merging them into a
+    # rule-based fallback or a passed-through report would pass it off as LLM output.
+    trace = ((report or {}).get("metadata") or {}).get("trace") or {}
+    return trace.get("outcome") in ("openai", "openai_partial")
+
+
+def targeted_fields(previous: Optional[EventInput], event_input: EventInput) -> Optional[List[str]]:
+    # The report fields an edit from `previous` reaches, or None when every event
+    # field changed (or targeted updates are off) and a full generation is needed.
+    if previous is None or not OPENAI_TARGETED_UPDATES:
+        return None
+    changed = changed_fields(previous, event_input)
+    if len(changed) == len(EVENT_FIELDS):
+        return None
+    return list(dict.fromkeys(path for field in EVENT_FIELDS if field in changed for path in EDIT_FIELDS[field]))
+
+
+def _row_fields(fields: Sequence[str]) -> List[str]:
+    return [path.partition(".")[2] for path in fields if path.startswith("opportunities.")]
+
+
+@lru_cache(maxsize=64)
+def _section_validator(fields: Tuple[str, ...]) -> Validator:
+    # Rewritten rows come back with their ticker so they can be matched up.
+    if _row_fields(fields):
+        fields = ("opportunities.ticker",) + fields
+    return Validator(subschema(REPORT_SCHEMA, fields))
+
+
+def _build_section_messages(
+    event_input: EventInput, previous: Dict[str, object], fields: Sequence[str]
+) -> List[Dict[str, str]]:
+    extra = ""
+    if _row_fields(fields):
+        extra = "Return one opportunities item for each ticker in the unchanged sections, in the same order.\n"
+    system = SECTION_SYSTEM_PROMPT.format(schema=render_schema(_section_validator(tuple(fields)).schema), extra=extra)
+    # The unchanged sections go along as context so the new ones stay consistent with them.
+    kept: Dict[str, object] = {}
+    for name, value in previous.items():
+        if name in ("generated_at", "event_name", "metadata") or name in fields:
+            continue
+        if name == "opportunities":
+            value = [item["ticker"] for item in value]
+        elif isinstance(value, dict):
+            value = {key: item for key, item in value.items() if f"{name}.{key}" not in fields}
+        kept[name] = value
+    user = _user_message(event_input) + "\n\nUnchanged report sections:\n" + json.dumps(kept, ensure_ascii=False)
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
+
+
+def _merge_sections(
+    previous: Dict[str, object], body: Dict[str, object], fields: Sequence[str], event_input: EventInput
+) -> Dict[str, object]:
+    report = {name: value for name, value in copy.deepcopy(previous).items() if name != "metadata"}
+    rows = {item["ticker"]: item for item in body.get("opportunities") or ()}
+    for path in fields:
+        head, _, rest = path.partition(".")
+        if head == "opportunities":
+            # Rows the model skipped keep their old value.
+            for item in report[head]:
+                if item["ticker"] in rows:
+                    item[rest] = rows[item["ticker"]][rest]
+        elif rest:
+            report[head][rest] = body[head][rest]
+        else:
+            report[head] = body[head]
+    context = report["event_context"]
+    if not context["timing"]:
+        context["timing"] = event_input.expected_timing
+    report["generated_at"] = datetime.utcnow().isoformat()
+    report["event_name"] = event_input.name or context["overview"] or "Strategic Market Catalyst"
+    return report
+
+
+def _call_openai_sections(
+    event_input: EventInput,
+    previous: Dict[str, object],
+    fields: Sequence[str],
+    trace: RequestTrace,
+    budget: Optional[LatencyBudget] = None,
+) -> Dict[str, object]:
+    client = _client()
+    messages = _build_section_messages(event_input, previous, fields)
+    rows = len(previous.get("opportunities") or ()) * len(_row_fields(fields))
+    max_tokens = OPENAI_SECTION_MAX_TOKENS + rows * OPPORTUNITY_FIELD_TOKENS
+
+    def request(timeout: float):
+        return client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=messages,
+            temperature=0.35,
+            max_tokens=max_tokens,
+            timeout=timeout,
+        )
+
+    with trace.stage("llm_call"):
+        response = RESILIENCE.call(request, budget, trace=trace, kind="sections")
+    trace.record_usage(response.usage)
+    content = response.choices[0].message.content or ""
+    with trace.stage("extract_json"):
+        _, data = find_json_object(content)
+    if data is None:
+        JSON_FAILURES.inc(reason="missing" if "{" not in content else "decode")
+        raise ValueError("LLM response did not contain valid JSON.")
+    with trace.stage("ensure_structure"):
+        body, issues = _section_validator(tuple(fields)).validate(data)
+    _record_issues(issues, trace)
+    return _merge_sections(previous, body, fields, event_input)
+
+
+def update_report(
+    event_input: EventInput,
+    previous: Optional[Tuple[EventInput, Dict[str, object]]] = None,
+    builder: Optional[IncrementalReportBuilder] = None,
+    trace: Optional[RequestTrace] = None,
+) -> Tuple[Dict[str, object], str]:
+    # Like generate_report, but `previous` (the last event and the report made
+    # for it) lets an edit redo only the sections it affects. Merged reports
+    # depend on `previous` as well as the event, so they are never cached.
+    trace = trace or RequestTrace()
+    if not OPENAI_ENABLED:
+        builder = builder or IncrementalReportBuilder()
+        with trace.stage("mock_report"):
+            report = builder.build(event_input)
+        trace.event(f"recomputed:{len(builder.recomputed)}/{len(builder.sections)}")
+        return _finish(report, MOCK_NOTE, trace, "mock")
+
+    fields = targeted_fields(previous[0], event_input) if previous and targeted_base(previous[1]) else None
+    if fields is None:
+        return generate_report(event_input, trace)
+
+    budget = RESILIENCE.budget()
+    key = _cache_key(event_input)
+    cached = _cached_report(key, trace)
+    if cached:
+        return cached
+    if not fields:
+        trace.event("unchanged")
+        report = _merge_sections(previous[1], {}, (), event_input)
+        return _finish(report, "Event unchanged; kept the previous report.", trace, "unchanged")
+
+    trace.event("targeted:" + ",".join(fields))
+    try:
+        report = _call_openai_sections(event_input, previous[1], fields, trace, budget)
+    except Exception as exc:
+        return _fallback_report(event_input, exc, trace)
+    note = f"OpenAI ({OPENAI_MODEL}) regenerated {len(fields)} report fields for the edit."
+    return _finish(report, note, trace, "openai_partial")
+
+
+def _report_sections(report: Dict[str, object]) -> Iterator[Section]:
+    for key in ("headline_summary", "event_context", "market_impact"):
+        yield key, report[key]
+    for opportunity in report["opportunities"]:
+        yield "opportunity", opportunity
+    for key in ("summary_insights", "risk_note", "citations"):
+        yield key, report[key]
+
+
+# Both stream paths finish with (report, complete); only sharding can leave a report incomplete.
+def _stream_single(
+    event_input: EventInput, trace: RequestTrace
+) -> Generator[Section, None, Tuple[Dict[str, object], bool]]:
+    client = _client()
+    messages = _build_messages(event_input)
+    budget = RESILIENCE.budget()
+
+    def request(timeout: float):
+        return client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=messages,
+            temperature=0.35,
+            max_tokens=3500,
+            stream=True,
+            stream_options={"include_usage": True},
+            timeout=timeout,
+        )
+
+    # The stage spans the whole stream, including time the caller spends rendering sections.
+    with trace.stage("llm_stream"):
+        # Retries only cover opening the stream; once sections are shown a failure falls back.
+        stream = RESILIENCE.call(request, budget, hedge=False, trace=trace)
+        parser = IncrementalReportParser()
+        chunks: List[str] = []
+        first_section = True
+        for chunk in RESILIENCE.stream(stream, budget):
+            if getattr(chunk, "usage", None):
+                trace.record_usage(chunk.usage)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            chunks.append(delta)
+            for section, value in parser.feed(delta):
+                if section == "opportunity":
+                    if not isinstance(value, dict):
+                        continue
+                    value = _normalise_opportunities([value])[0]
+                if first_section:
+                    trace.mark("first_section")
+                    first_section = False
+                yield section, value
+    return _parse_completion("".join(chunks), event_input, trace), True
+
+
+def _stream_sharded(
+    event_input: EventInput, trace: RequestTrace
+) -> Generator[Section, None, Tuple[Dict[str, object], bool]]:
+    # The narrative and each shard render as their calls finish, in whatever order that is.
+    narrative: Optional[Dict[str, object]] = None
+    shard_rows: Dict[int, List[Dict[str, object]]] = {}
+    seen: Set[str] = set()
+    first_section = True
+    with trace.stage("llm_stream"):
+        for part, data in _sharded_parts(event_input, trace, RESILIENCE.budget()):
+            if first_section:
+                trace.mark("first_section")
+                first_section = False
+            if part < 0:
+                narrative = data
+                for key in ("headline_summary", "event_context", "market_impact"):
+                    if key in data:
+                        yield key, data[key]
+                continue
+            shard_rows[part] = _shard_rows(data)
+            for row in _dedupe_opportunities(_normalise_opportunities(shard_rows[part]), seen):
+                yield "opportunity", row
+    return _merge_shards(narrative, shard_rows, event_input, trace)
+
+
+# Yields (section, value) pairs as they arrive and finishes with ("complete", (report, note)).
+def stream_report(event_input: EventInput, trace: Optional[RequestTrace] = None) -> Iterator[Section]:
+    trace = trace or RequestTrace()
+    if not OPENAI_ENABLED:
+        report, note = _mock_report(event_input, trace)
+        yield from _report_sections(report)
+        yield "complete", (report, note)
+        return
+
+    key = _cache_key(event_input)
+    cached = _cached_report(key, trace)
+    if cached:
+        yield from _report_sections(cached[0])
+        yield "complete", cached
+        return
+
+    try:
+        stream_parts = _stream_sharded if OPENAI_OPPORTUNITY_SHARDS > 0 else _stream_single
+        report, complete = yield from stream_parts(event_input, trace)
+    except Exception as exc:
+        report, note = _fallback_report(event_input, exc, trace)
+        yield from _report_sections(report)
+        yield "complete", (report, note)
+        return
+
+    if complete:
+        REPORT_CACHE.put(key, report)
+    yield "complete", _finish(report, f"OpenAI ({OPENAI_MODEL}) streamed response.", trace, "openai")
+
+
+async def _acall_openai(
+    client: "AsyncOpenAI",
+    event_input: EventInput,
+    trace: Optional[RequestTrace] = None,
+    budget: Optional[LatencyBudget] = None,
+) -> Dict[str, object]:
+    trace = trace or RequestTrace()
+    messages = _build_messages(event_input)
+
+    def request(timeout: float):
+        return client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=messages,
+            temperature=0.35,
+            max_tokens=3500,
+            timeout=timeout,
+        )
+
+    with trace.stage("llm_call"):
+        response = await RESILIENCE.acall(request, budget, trace=trace)
+    trace.record_usage(response.usage)
+    return _parse_completion(response.choices[0].message.content, event_input, trace)
+
+
+async def agenerate_report(
+    event_input: EventInput,
+    client: Optional["AsyncOpenAI"] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    timeout: Optional[float] = None,
+    trace: Optional[RequestTrace] = None,
+) -> Tuple[Dict[str, object], str]:
+    trace = trace or RequestTrace()
+    if not OPENAI_ENABLED:
+        return _mock_report(event_input, trace)
+
+    key = _cache_key(event_input)
+    cached = _cached_report(key, trace)
+    if cached:
+        return cached
+
+    own_client = client is None
+    if own_client:
+        client = _async_client()
+    semaphore = semaphore or asyncio.Semaphore(1)
+
+    try:
+        # The budget covers the calls and retries, not the time spent queued on the semaphore.
+        async with semaphore:
+            report = await _acall_openai(client, event_input, trace, RESILIENCE.budget(timeout))
+        REPORT_CACHE.put(key, report)
+        return _finish(report, f"OpenAI ({OPENAI_MODEL}) response.", trace, "openai")
+    except Exception as exc:
+        return _fallback_report(event_input, exc, trace)
+    finally:
+        if own_client:
+            await client.close()
+
+
+async def agenerate_reports(
+    events: Iterable[EventInput],
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> List[Tuple[Dict[str, object], str]]:
+    event_list = list(events)
+    if not OPENAI_ENABLED:
+        return [await agenerate_report(event_input) for event_input in event_list]
+
+    semaphore = asyncio.Semaphore(concurrency or OPENAI_CONCURRENCY)
+    client = _async_client()
+    try:
+        return list(
+            await asyncio.gather(
+                *(
+                    agenerate_report(event_input, client=client, semaphore=semaphore, timeout=timeout)
+                    for event_input in event_list
+                )
+            )
+        )
+    finally:
+        await client.close()
+
+
+def generate_reports(events: Iterable[EventInput], workers: Optional[int] = None) -> List[Tuple[Dict[str, object], str]]:
+    event_list = list(events)
+    if not OPENAI_ENABLED:
+        # One trace per report, as generate_report gives, all started with the batch.
+        traces = [RequestTrace() for _ in event_list]
+        reports = build_mock_reports(event_list, workers=workers)
+        REPORT_HISTORY.add_many((report, "mock") for report in reports)
+        for report, trace in zip(reports, traces):
+            trace.event(f"batch:{len(event_list)}")
+            report["metadata"] = {"trace": trace.finish("mock")}
+        return [(report, MOCK_NOTE) for report in reports]
+
+    # LLM calls are network-bound, so threads are enough to overlap them.
+    with ThreadPoolExecutor(max_workers=workers or OPENAI_BATCH_WORKERS) as executor:
+        return list(executor.map(generate_report, event_list))
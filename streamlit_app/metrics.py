@@ -0,0 +1,250 @@
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels.get(name, "")) for name in self.labelnames), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[bisect_left(self.buckets, value)] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, counts in sorted(self._counts.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    labels = _format_labels(self.labelnames, key, f'le="{bound:g}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                cumulative += counts[-1]
+                labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {self._sums[key]:g}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "report_stage_seconds", "Time spent in each report pipeline stage.", ["stage"]
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "report_request_seconds", "End-to-end report generation time by outcome.", ["outcome"]
+)
+REQUESTS = REGISTRY.counter("report_requests_total", "Reports generated by outcome.", ["outcome"])
+FALLBACKS = REGISTRY.counter("report_fallbacks_total", "LLM failures that fell back to the mock engine.", ["reason"])
+CACHE_LOOKUPS = REGISTRY.counter("report_cache_lookups_total", "Report cache lookups by result.", ["result"])
+JSON_FAILURES = REGISTRY.counter("report_json_failures_total", "LLM responses that did not yield valid JSON.", ["reason"])
+SCHEMA_ISSUES = REGISTRY.counter(
+    "report_schema_issues_total", "Fields the schema validator coerced, defaulted or dropped.", ["code"]
+)
+LLM_RETRIES = REGISTRY.counter("llm_retries_total", "LLM calls retried after a transient failure.")
+LLM_HEDGES = REGISTRY.counter("llm_hedges_total", "Hedged second LLM requests sent after the latency threshold.")
+BREAKER_TRANSITIONS = REGISTRY.counter(
+    "llm_circuit_transitions_total", "LLM circuit breaker state changes by new state.", ["state"]
+)
+LLM_TOKENS = REGISTRY.counter("llm_tokens_total", "Tokens reported by the LLM API.", ["kind"])
+
+
+def render_prometheus() -> str:
+    return REGISTRY.render_prometheus()
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, stage=stage)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
+
+
+class RequestTrace:
+    def __init__(self) -> None:
+        self.trace_id = uuid.uuid4().hex
+        self.started = time.perf_counter()
+        self.stages: List[Dict[str, object]] = []
+        self.events: List[str] = []
+        self.usage: Dict[str, int] = {}
+        self.outcome: Optional[str] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stages.append(
+                {"stage": name, "start_ms": round((started - self.started) * 1000, 3), "ms": round(elapsed * 1000, 3)}
+            )
+            observe_stage(name, elapsed)
+
+    def mark(self, name: str) -> None:
+        # A zero-length stage that records how far into the request a milestone landed.
+        offset = time.perf_counter() - self.started
+        self.stages.append({"stage": name, "start_ms": round(offset * 1000, 3), "ms": 0.0})
+        observe_stage(name, offset)
+
+    def event(self, name: str) -> None:
+        self.events.append(name)
+
+    def record_usage(self, usage: object) -> None:
+        # Summed, since a sharded report makes several calls under one trace. Not
+        # thread-safe: shard threads hand their usage back to the calling thread.
+        if usage is None:
+            return
+        for kind in ("prompt_tokens", "completion_tokens", "total_tokens"):
+            value = getattr(usage, kind, None)
+            if isinstance(value, int):
+                self.usage[kind] = self.usage.get(kind, 0) + value
+                if kind != "total_tokens":
+                    LLM_TOKENS.inc(value, kind=kind.split("_")[0])
+
+    def finish(self, outcome: str) -> Dict[str, object]:
+        self.outcome = outcome
+        elapsed = time.perf_counter() - self.started
+        REQUESTS.inc(outcome=outcome)
+        REQUEST_SECONDS.observe(elapsed, outcome=outcome)
+        return self.to_dict(elapsed)
+
+    def to_dict(self, elapsed: Optional[float] = None) -> Dict[str, object]:
+        if elapsed is None:
+            elapsed = time.perf_counter() - self.started
+        return {
+            "trace_id": self.trace_id,
+            "outcome": self.outcome,
+            "total_ms": round(elapsed * 1000, 3),
+            "stages": list(self.stages),
+            "events": list(self.events),
+            "usage": dict(self.usage),
+        }
+
+
+_server: Optional["ThreadingHTTPServer"] = None
+_server_lock = threading.Lock()
+
+
+def serve_metrics(port: int, host: str = "0.0.0.0") -> "ThreadingHTTPServer":
+    # Idempotent: Streamlit re-executes the script on every rerun. http.server
+    # is imported here so processes that never export metrics skip it.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), MetricsHandler)
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-exporter", daemon=True).start()
+        return _server
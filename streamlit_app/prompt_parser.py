@@ -0,0 +1,115 @@
+import re
+from typing import Iterator, List, Tuple
+
+from report_engine import EventInput
+
+# Pasted documents are split a chunk at a time, never copied whole.
+CHUNK_SIZE = 1 << 16
+NON_SPACE = re.compile(r"\S")
+
+
+def split_driver_line(text: str) -> List[str]:
+    parts = re.split(r"[;,•]", text)
+    return [part.strip("-• ").strip() for part in parts if part.strip("-• ").strip()]
+
+
+def _chunks(text: str, start: int, end: int) -> Iterator[Tuple[int, str]]:
+    # (offset, chunk) pieces of text[start:end] that end just after a "\n", so
+    # splitting each with str.splitlines gives the same lines as the whole.
+    while start < end:
+        cut = text.find("\n", start + CHUNK_SIZE, end)
+        cut = end if cut < 0 else cut + 1
+        yield start, text[start:cut]
+        start = cut
+
+
+def _lines(text: str, start: int, end: int) -> Iterator[str]:
+    for _, chunk in _chunks(text, start, end):
+        yield from chunk.splitlines()
+
+
+def _event(
+    text: str, start: int, end: int, name: str, timing: str, drivers: List[str], description_parts: List[str]
+) -> EventInput:
+    if not name:
+        lines = [stripped for stripped in (line.strip() for line in _lines(text, start, end)) if stripped]
+        if lines:
+            name = lines[0]
+            description_parts = lines[1:]
+
+    if not drivers and description_parts:
+        # Attempt to infer drivers from semicolon- or comma-separated clauses in description.
+        inferred = split_driver_line("; ".join(description_parts))
+        drivers = inferred[:4]
+
+    description = " ".join(description_parts) if description_parts else text[start:end].strip()
+
+    return EventInput(
+        name=name,
+        expected_timing=timing,
+        description=description,
+        key_drivers=drivers,
+    )
+
+
+def _parse(text: str, split: bool) -> Iterator[EventInput]:
+    # One pass over the lines. With split, every "Event:" line after the first
+    # closes the event so far, which is yielded before parsing goes on; lines
+    # before the first "Event:" belong to it.
+    start = 0
+    name = ""
+    timing = ""
+    drivers: List[str] = []
+    description_parts: List[str] = []
+    capture_drivers = False
+    has_event = False
+
+    # Short prompts, the usual chat input, skip the chunking.
+    chunks = ((0, text),) if len(text) <= CHUNK_SIZE else _chunks(text, 0, len(text))
+    for offset, chunk in chunks:
+        for raw_line in chunk.splitlines(True):
+            offset += len(raw_line)
+            line = raw_line.strip()
+            if not line:
+                capture_drivers = False
+                continue
+
+            lower = line[:8].lower()
+            if lower.startswith("event:"):
+                if split and has_event:
+                    position = offset - len(raw_line)
+                    yield _event(text, start, position, name, timing, drivers, description_parts)
+                    start = position
+                    timing = ""
+                    drivers = []
+                    description_parts = []
+                name = line.split(":", 1)[1].strip()
+                has_event = True
+                capture_drivers = False
+                continue
+            if lower.startswith("timing:"):
+                timing = line.split(":", 1)[1].strip()
+                capture_drivers = False
+                continue
+            if lower.startswith("drivers:"):
+                rest = line.split(":", 1)[1].strip()
+                drivers.extend(split_driver_line(rest))
+                capture_drivers = True
+                continue
+            if capture_drivers and (line.startswith("-") or line.startswith("•") or line.startswith("*")):
+                drivers.append(line.lstrip("-•*").strip())
+                continue
+
+            description_parts.append(line)
+
+    if not split or NON_SPACE.search(text, start):
+        yield _event(text, start, len(text), name, timing, drivers, description_parts)
+
+
+def parse_prompt(prompt: str) -> EventInput:
+    return next(_parse(prompt, split=False))
+
+
+def iter_events(text: str) -> Iterator[EventInput]:
+    # Text with one "Event:" line (or none) yields exactly parse_prompt(text).
+    return _parse(text, split=True)
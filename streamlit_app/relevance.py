@@ -0,0 +1,90 @@
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from universe import PLACEHOLDER_PATTERN, OpportunityUniverse
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in into is it its of on or that the their this to with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) > 1 and token not in STOPWORDS]
+
+
+def _opportunity_text(universe: OpportunityUniverse, row: int) -> str:
+    columns = universe.columns
+    return " ".join(
+        [
+            columns["company"][row],
+            columns["sector"][row],
+            columns["country"][row],
+            PLACEHOLDER_PATTERN.sub(" ", universe.mechanism_templates[row]),
+            PLACEHOLDER_PATTERN.sub(" ", universe.rationale_templates[row]),
+            *universe.sources[row],
+        ]
+    )
+
+
+class RelevanceIndex:
+    def __init__(self, universe: OpportunityUniverse) -> None:
+        # TF-IDF term vectors stored row-wise in CSR form: a 10k-row universe
+        # holds a few hundred thousand weights rather than a dense matrix.
+        self.vocabulary: Dict[str, int] = {}
+        row_terms: List[Counter] = []
+        for row in range(len(universe)):
+            counts: Counter = Counter()
+            for token in tokenize(_opportunity_text(universe, row)):
+                counts[self.vocabulary.setdefault(token, len(self.vocabulary))] += 1
+            row_terms.append(counts)
+
+        document_frequency = np.zeros(max(len(self.vocabulary), 1), dtype=np.float32)
+        for counts in row_terms:
+            document_frequency[list(counts)] += 1
+        self.idf = (np.log((1 + len(row_terms)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        indices: List[int] = []
+        weights: List[float] = []
+        indptr = [0]
+        for counts in row_terms:
+            if not counts:
+                # np.add.reduceat needs every row segment to be non-empty.
+                counts = Counter({0: 0})
+            row_weights = [(1 + math.log(tf)) * float(self.idf[term]) if tf else 0.0 for term, tf in counts.items()]
+            norm = math.sqrt(sum(weight * weight for weight in row_weights)) or 1.0
+            indices.extend(counts)
+            weights.extend(weight / norm for weight in row_weights)
+            indptr.append(len(indices))
+
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def query_vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(len(self.idf), dtype=np.float32)
+        for token, tf in Counter(tokenize(text)).items():
+            term = self.vocabulary.get(token)
+            if term is not None:
+                vector[term] = (1 + math.log(tf)) * self.idf[term]
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def scores(self, text: str) -> np.ndarray:
+        if not len(self):
+            return np.zeros(0, dtype=np.float32)
+        return np.add.reduceat(self.weights * self.query_vector(text)[self.indices], self.indptr[:-1])
+
+    def top_k(self, text: str, k: int, rows: Optional[Iterable[int]] = None) -> List[int]:
+        scores = self.scores(text).tolist()
+        candidates: Sequence[int] = range(len(self)) if rows is None else list(rows)
+        # nlargest is stable, so equally scored rows keep universe order.
+        return heapq.nlargest(k, candidates, key=scores.__getitem__)
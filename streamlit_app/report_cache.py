@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from report_engine import EventInput, Report
+
+# Disk pruning lists the cache directory, so only do it every few writes.
+DISK_PRUNE_INTERVAL = 32
+
+
+def _normalise_text(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+def normalise_event(event_input: EventInput) -> Dict[str, object]:
+    drivers = {_normalise_text(driver) for driver in event_input.key_drivers}
+    drivers.discard("")
+    return {
+        "name": _normalise_text(event_input.name),
+        "expected_timing": _normalise_text(event_input.expected_timing),
+        "description": _normalise_text(event_input.description),
+        "key_drivers": sorted(drivers),
+    }
+
+
+def cache_key(event_input: EventInput, model: str, prompt_version: str) -> str:
+    payload = {"event": normalise_event(event_input), "model": model, "prompt_version": prompt_version}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def report_identity(report: Dict[str, object], timestamped: bool = True) -> str:
+    # Trace metadata differs per request; the identity only covers the content.
+    # Untimestamped, regenerating the same content gives the same identity.
+    skip = ("metadata",) if timestamped else ("metadata", "generated_at")
+    content = {key: value for key, value in report.items() if key not in skip}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ReportCache:
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_entries: int = 256,
+        max_disk_entries: int = 5000,
+        ttl_seconds: float = 86400.0,
+    ) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        # The memory tier holds typed reports: slotted, with interned securities,
+        # and rebuilt into fresh dicts on every hit instead of deep-copied.
+        self._memory: "OrderedDict[str, Tuple[float, Report]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def _expired(self, stored_at: float) -> bool:
+        return time.time() - stored_at > self.ttl_seconds
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _remember(self, key: str, stored_at: float, report: Report) -> None:
+        self._memory[key] = (stored_at, report)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, Dict[str, object]]]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        stored_at = float(entry.get("stored_at", 0))
+        if self._expired(stored_at):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return stored_at, entry["report"]
+
+    def _write_disk(self, key: str, stored_at: float, report: Dict[str, object]) -> None:
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump({"stored_at": stored_at, "report": report}, handle, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._disk_writes += 1
+            prune = self._disk_writes % DISK_PRUNE_INTERVAL == 0
+        if prune:
+            self.prune_disk()
+
+    def prune_disk(self) -> None:
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        entries: List[Tuple[float, str]] = []
+        now = time.time()
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                modified = os.path.getmtime(path)
+            except OSError:
+                continue
+            if now - modified > self.ttl_seconds:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            entries.append((modified, path))
+        entries.sort()
+        for _, path in entries[: max(0, len(entries) - self.max_disk_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def get(self, key: str) -> Optional[Dict[str, object]]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and self._expired(entry[0]):
+                del self._memory[key]
+                entry = None
+            if entry:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1].to_dict()
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, report = entry
+            self._remember(key, stored_at, Report.from_dict(report))
+            self.hits += 1
+            self.disk_hits += 1
+        return report
+
+    def put(self, key: str, report: Dict[str, object]) -> None:
+        if not self.enabled:
+            return
+        stored_at = time.time()
+        snapshot = Report.from_dict(report)
+        with self._lock:
+            self._remember(key, stored_at, snapshot)
+        if self.directory:
+            self._write_disk(key, stored_at, report)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.directory and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+            }
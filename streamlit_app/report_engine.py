@@ -1,10 +1,14 @@
+import copy
+import os
 import re
+import sys
+import weakref
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Sequence
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
-
-Sentiment = str
+from sentiment import Sentiment, SentimentLexicon, SentimentScore
+from universe import OpportunityUniverse, compile_template
 
 
 @dataclass(frozen=True)
@@ -15,6 +19,186 @@ class EventInput:
     key_drivers: Sequence[str]
 
 
+# Typed report model. The nested dicts the pipeline passes around are
+# converted losslessly with Report.from_dict / Report.to_dict; retained
+# reports hold slotted instances instead, and the per-security fields every
+# opportunity repeats (ticker, company, sector, country, sources) live in one
+# interned Security shared by every report that mentions it.
+_SECURITIES: "weakref.WeakValueDictionary[Tuple[object, ...], Security]" = weakref.WeakValueDictionary()
+
+
+@dataclass(frozen=True)
+class Security:
+    __slots__ = ("ticker", "company", "sector", "country", "sources", "__weakref__")
+    ticker: str
+    company: str
+    sector: str
+    country: str
+    sources: Tuple[str, ...]
+
+
+def intern_security(ticker: str, company: str, sector: str, country: str, sources: Iterable[str]) -> Security:
+    # The key is built from interned strings so the registry holds no second copies.
+    key = (
+        sys.intern(ticker),
+        sys.intern(company),
+        sys.intern(sector),
+        sys.intern(country),
+        tuple(sys.intern(str(source)) for source in sources),
+    )
+    security = _SECURITIES.get(key)
+    if security is None:
+        security = _SECURITIES[key] = Security(*key)
+    return security
+
+
+@dataclass(frozen=True)
+class Opportunity:
+    __slots__ = ("security", "expected_direction", "time_horizon", "mechanism", "investability_score", "rationale")
+    security: Security
+    expected_direction: str
+    time_horizon: str
+    mechanism: str
+    investability_score: int
+    rationale: str
+
+    @property
+    def ticker(self) -> str:
+        return self.security.ticker
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "Opportunity":
+        return cls(
+            intern_security(
+                str(data["ticker"]), str(data["company"]), str(data["sector"]), str(data["country"]), data.get("sources", ())
+            ),
+            sys.intern(str(data["expected_direction"])),
+            sys.intern(str(data["time_horizon"])),
+            data["mechanism"],
+            data["investability_score"],
+            data["rationale"],
+        )
+
+    def to_dict(self) -> Dict[str, object]:
+        security = self.security
+        return {
+            "ticker": security.ticker,
+            "company": security.company,
+            "sector": security.sector,
+            "country": security.country,
+            "expected_direction": self.expected_direction,
+            "time_horizon": self.time_horizon,
+            "mechanism": self.mechanism,
+            "investability_score": self.investability_score,
+            "rationale": self.rationale,
+            "sources": list(security.sources),
+        }
+
+
+@dataclass(frozen=True)
+class HorizonImpact:
+    __slots__ = ("horizon", "outlook")
+    horizon: str
+    outlook: str
+
+
+@dataclass(frozen=True)
+class EventContext:
+    __slots__ = ("overview", "timing", "significance", "context_points")
+    overview: str
+    timing: str
+    significance: str
+    context_points: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class MarketImpact:
+    __slots__ = ("sentiment", "macro_themes", "sector_outlook", "horizon_impacts")
+    sentiment: str
+    macro_themes: Tuple[str, ...]
+    sector_outlook: Tuple[str, ...]
+    horizon_impacts: Tuple[HorizonImpact, ...]
+
+
+@dataclass(frozen=True)
+class Report:
+    __slots__ = (
+        "generated_at",
+        "event_name",
+        "headline_summary",
+        "event_context",
+        "market_impact",
+        "opportunities",
+        "summary_insights",
+        "risk_note",
+        "citations",
+        "metadata",
+    )
+    generated_at: str
+    event_name: str
+    headline_summary: str
+    event_context: EventContext
+    market_impact: MarketImpact
+    opportunities: Tuple[Opportunity, ...]
+    summary_insights: Tuple[str, ...]
+    risk_note: str
+    citations: Tuple[str, ...]
+    metadata: Optional[Dict[str, object]]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "Report":
+        context = data["event_context"]
+        impact = data["market_impact"]
+        return cls(
+            data["generated_at"],
+            data["event_name"],
+            data["headline_summary"],
+            EventContext(context["overview"], context["timing"], context["significance"], tuple(context["context_points"])),
+            MarketImpact(
+                sys.intern(impact["sentiment"]),
+                tuple(impact["macro_themes"]),
+                tuple(impact["sector_outlook"]),
+                tuple(HorizonImpact(sys.intern(row["horizon"]), row["outlook"]) for row in impact["horizon_impacts"]),
+            ),
+            tuple(Opportunity.from_dict(item) for item in data["opportunities"]),
+            tuple(data["summary_insights"]),
+            data["risk_note"],
+            tuple(data["citations"]),
+            copy.deepcopy(data["metadata"]) if "metadata" in data else None,
+        )
+
+    def to_dict(self) -> Dict[str, object]:
+        # Always a fresh tree, safe for callers to mutate.
+        context = self.event_context
+        impact = self.market_impact
+        report: Dict[str, object] = {
+            "generated_at": self.generated_at,
+            "event_name": self.event_name,
+            "headline_summary": self.headline_summary,
+            "event_context": {
+                "overview": context.overview,
+                "timing": context.timing,
+                "significance": context.significance,
+                "context_points": list(context.context_points),
+            },
+            "market_impact": {
+                "sentiment": impact.sentiment,
+                "macro_themes": list(impact.macro_themes),
+                "sector_outlook": list(impact.sector_outlook),
+                "horizon_impacts": [{"horizon": row.horizon, "outlook": row.outlook} for row in impact.horizon_impacts],
+            },
+            "opportunities": [opportunity.to_dict() for opportunity in self.opportunities],
+            "summary_insights": list(self.summary_insights),
+            "risk_note": self.risk_note,
+            "citations": list(self.citations),
+        }
+        if self.metadata is not None:
+            report["metadata"] = copy.deepcopy(self.metadata)
+        return report
+
+
+# Seed records for the default opportunity universe; reports read the columnar
+# OPPORTUNITY_UNIVERSE built from them below.
 BASE_OPPORTUNITIES: List[Dict[str, object]] = [
     {
         "ticker": "NVDA",
@@ -343,16 +527,28 @@ BASE_OPPORTUNITIES: List[Dict[str, object]] = [
 ]
 
 
+# Mock reports keep the most relevant entries rather than the whole universe.
+MOCK_OPPORTUNITY_LIMIT = 20
+
+# A mock report takes about 0.15 ms, and the parent spends about a third of
+# that unpickling each pooled result, so a pool's ~60 ms start-up is only won
+# back from roughly 600 events. Smaller batches, such as a pasted multi-event
+# prompt, are built serially.
+PARALLEL_BATCH_THRESHOLD = 1000
+
 BULLISH_KEYWORDS = ["stimulus", "investment", "recovery", "growth", "innovation", "ai", "alliances", "easing", "support"]
 BEARISH_KEYWORDS = ["sanction", "recession", "war", "conflict", "crackdown", "ban", "shortage", "tightening", "slowdown"]
 
+# Bearish terms carry more weight so a single risk flag still outweighs one bullish mention.
+SENTIMENT_WEIGHTS: Dict[str, float] = {
+    **{keyword: 1.0 for keyword in BULLISH_KEYWORDS},
+    **{keyword: -1.5 for keyword in BEARISH_KEYWORDS},
+}
+SENTIMENT_LEXICON = SentimentLexicon(SENTIMENT_WEIGHTS)
 
-def fill_template(template: str, replacements: Dict[str, str]) -> str:
-    def _replace(match: re.Match[str]) -> str:
-        key = match.group(1).strip()
-        return replacements.get(key, "")
 
-    return re.sub(r"{{(.*?)}}", _replace, template)
+def fill_template(template: str, replacements: Dict[str, str]) -> str:
+    return compile_template(template)(replacements)
 
 
 def dedupe(values: Sequence[str]) -> List[str]:
@@ -366,13 +562,16 @@ def dedupe(values: Sequence[str]) -> List[str]:
     return result
 
 
+def score_sentiment(text: str) -> SentimentScore:
+    return SENTIMENT_LEXICON.score(text)
+
+
 def determine_sentiment(text: str) -> Sentiment:
-    normalized = text.lower()
-    if any(keyword in normalized for keyword in BEARISH_KEYWORDS):
-        return "Bearish"
-    if any(keyword in normalized for keyword in BULLISH_KEYWORDS):
-        return "Bullish"
-    return "Neutral"
+    return SENTIMENT_LEXICON.score(text)[0]
+
+
+def classify_sentiments(texts: Iterable[str]) -> List[SentimentScore]:
+    return SENTIMENT_LEXICON.score_many(texts)
 
 
 def derive_macro_themes(drivers: Sequence[str], sentiment: Sentiment) -> List[str]:
@@ -446,75 +645,223 @@ def build_event_context(event_input: EventInput) -> Dict[str, object]:
     }
 
 
-def build_opportunities(event_name: str, drivers_text: str, timeline: str, sentiment: Sentiment) -> List[Dict[str, object]]:
+OPPORTUNITY_UNIVERSE = OpportunityUniverse.from_records(BASE_OPPORTUNITIES)
+
+
+def rank_opportunities(
+    query_text: str,
+    k: int = MOCK_OPPORTUNITY_LIMIT,
+    rows: Optional[Iterable[int]] = None,
+    universe: Optional[OpportunityUniverse] = None,
+) -> List[int]:
+    universe = universe or OPPORTUNITY_UNIVERSE
+    return universe.relevance.top_k(query_text, k, rows)
+
+
+def build_opportunities(
+    event_name: str,
+    drivers_text: str,
+    timeline: str,
+    sentiment: Sentiment,
+    rows: Optional[Sequence[int]] = None,
+    universe: Optional[OpportunityUniverse] = None,
+) -> List[Dict[str, object]]:
+    universe = universe or OPPORTUNITY_UNIVERSE
     replacements = {"event": event_name, "drivers": drivers_text, "timing": timeline, "sentiment": sentiment}
+    columns = universe.columns
+    tickers = columns["ticker"]
+    companies = columns["company"]
+    sectors = columns["sector"]
+    countries = columns["country"]
+    directions = columns["expected_direction"]
+    horizons = columns["time_horizon"]
     opportunities: List[Dict[str, object]] = []
 
-    for item in BASE_OPPORTUNITIES:
+    for row in range(len(universe)) if rows is None else rows:
         opportunity = {
-            "ticker": item["ticker"],
-            "company": item["company"],
-            "sector": item["sector"],
-            "country": item["country"],
-            "expected_direction": item["expected_direction"],
-            "time_horizon": item["time_horizon"],
-            "mechanism": fill_template(item["mechanism_template"], replacements),
-            "investability_score": item["investability_score"],
-            "rationale": fill_template(item["rationale_template"], replacements),
-            "sources": item["sources"],
+            "ticker": tickers[row],
+            "company": companies[row],
+            "sector": sectors[row],
+            "country": countries[row],
+            "expected_direction": directions[row],
+            "time_horizon": horizons[row],
+            "mechanism": universe.mechanisms[row](replacements),
+            "investability_score": universe.investability_scores[row],
+            "rationale": universe.rationales[row](replacements),
+            "sources": universe.sources[row],
         }
         opportunities.append(opportunity)
 
     return opportunities
 
 
-def build_mock_report(event_input: EventInput) -> Dict[str, object]:
-    event_name = event_input.name.strip() or "Strategic Market Catalyst"
-    drivers = [driver.strip() for driver in event_input.key_drivers if driver.strip()]
-    drivers_text = "; ".join(drivers) if drivers else "the stated catalysts"
-    timeline = event_input.expected_timing.strip() or "the specified timeline"
-    description_text = event_input.description.strip() or "No narrative provided yet—supply qualitative colour for accuracy."
-
-    sentiment = determine_sentiment(f"{description_text} {drivers_text}")
-    macro_themes = derive_macro_themes(drivers, sentiment)
-    sector_outlook = derive_sector_outlook(sentiment, drivers, event_name)
-    horizon_impacts = build_horizon_impacts(sentiment, drivers_text, timeline)
-    event_context = build_event_context(event_input)
-    opportunities = build_opportunities(event_name, drivers_text, timeline, sentiment)
-
-    headline_summary = f"{event_name}: Preliminary {sentiment.lower()} stance anchored on {macro_themes[0] if macro_themes else 'macro reassessment'}."
-    top_tickers = ", ".join(op["ticker"] for op in opportunities[:3])
+def _event_name(name: str) -> str:
+    return name.strip() or "Strategic Market Catalyst"
+
+
+def _clean_drivers(key_drivers: Sequence[str]) -> List[str]:
+    return [driver.strip() for driver in key_drivers if driver.strip()]
+
+
+def _drivers_text(drivers: Sequence[str]) -> str:
+    return "; ".join(drivers) if drivers else "the stated catalysts"
+
+
+def _timeline(expected_timing: str) -> str:
+    return expected_timing.strip() or "the specified timeline"
+
+
+def _description_text(description: str) -> str:
+    return description.strip() or "No narrative provided yet—supply qualitative colour for accuracy."
+
+
+def _sentiment(description_text: str, drivers_text: str) -> Sentiment:
+    return determine_sentiment(f"{description_text} {drivers_text}")
+
+
+def _event_context(name: str, expected_timing: str, description: str, key_drivers: Sequence[str]) -> Dict[str, object]:
+    return build_event_context(EventInput(name, expected_timing, description, key_drivers))
+
+
+def _ranked_rows(event_name: str, description: str, drivers: Sequence[str]) -> List[int]:
+    return rank_opportunities(" ".join([event_name, description, *drivers]))
+
 
-    summary_insights = [
+def _opportunities(
+    event_name: str, drivers_text: str, timeline: str, sentiment: Sentiment, ranked_rows: Sequence[int]
+) -> List[Dict[str, object]]:
+    return build_opportunities(event_name, drivers_text, timeline, sentiment, rows=ranked_rows)
+
+
+def _headline_summary(event_name: str, sentiment: Sentiment, macro_themes: Sequence[str]) -> str:
+    return f"{event_name}: Preliminary {sentiment.lower()} stance anchored on {macro_themes[0] if macro_themes else 'macro reassessment'}."
+
+
+def _summary_insights(
+    event_name: str,
+    sentiment: Sentiment,
+    macro_themes: Sequence[str],
+    sector_outlook: Sequence[str],
+    timeline: str,
+    opportunities: Sequence[Dict[str, object]],
+) -> List[str]:
+    top_tickers = ", ".join(op["ticker"] for op in opportunities[:3])
+    return [
         f"{event_name} screens as {sentiment.lower()} with emphasis on {', '.join(macro_themes[:3])}.",
         f"Sector leadership likely features {' '.join(sector_outlook[:3])}",
         f"Initial focus tickers: {top_tickers}; recalibrate sizing as milestones on {timeline} emerge.",
     ]
 
-    risk_note = (
+
+def _risk_note(drivers_text: str) -> str:
+    return (
         f"Scenario sensitivity remains elevated—validate assumptions on {drivers_text} with real-time data, "
         "monitor policy communications, and size exposures within risk budget."
     )
 
-    citations = [
+
+def _citations() -> List[str]:
+    return [
         "IMF World Economic Outlook (latest edition)",
         "Bloomberg Terminal – Thematic Intelligence (placeholder)",
         "Reuters – Market Newswire (placeholder)",
     ]
 
+
+@dataclass(frozen=True)
+class Section:
+    name: str
+    inputs: Tuple[str, ...]
+    compute: Callable[..., object]
+
+
+EVENT_FIELDS = ("name", "expected_timing", "description", "key_drivers")
+
+# The mock report as a dependency graph, in evaluation order. Inputs name
+# EventInput fields or earlier sections, so the incremental builder can tell
+# which sections an edited field reaches.
+MOCK_SECTIONS: Tuple[Section, ...] = (
+    Section("event_name", ("name",), _event_name),
+    Section("drivers", ("key_drivers",), _clean_drivers),
+    Section("drivers_text", ("drivers",), _drivers_text),
+    Section("timeline", ("expected_timing",), _timeline),
+    Section("description_text", ("description",), _description_text),
+    Section("sentiment", ("description_text", "drivers_text"), _sentiment),
+    Section("macro_themes", ("drivers", "sentiment"), derive_macro_themes),
+    Section("sector_outlook", ("sentiment", "drivers", "event_name"), derive_sector_outlook),
+    Section("horizon_impacts", ("sentiment", "drivers_text", "timeline"), build_horizon_impacts),
+    Section("event_context", EVENT_FIELDS, _event_context),
+    Section("ranked_rows", ("event_name", "description", "drivers"), _ranked_rows),
+    Section("opportunities", ("event_name", "drivers_text", "timeline", "sentiment", "ranked_rows"), _opportunities),
+    Section("headline_summary", ("event_name", "sentiment", "macro_themes"), _headline_summary),
+    Section(
+        "summary_insights",
+        ("event_name", "sentiment", "macro_themes", "sector_outlook", "timeline", "opportunities"),
+        _summary_insights,
+    ),
+    Section("risk_note", ("drivers_text",), _risk_note),
+    Section("citations", (), _citations),
+)
+
+
+def event_fields(event_input: EventInput) -> Dict[str, object]:
+    fields: Dict[str, object] = {field: getattr(event_input, field) for field in EVENT_FIELDS}
+    fields["key_drivers"] = tuple(event_input.key_drivers)
+    return fields
+
+
+def assemble_mock_report(values: Dict[str, object]) -> Dict[str, object]:
     return {
         "generated_at": datetime.utcnow().isoformat(),
-        "event_name": event_name,
-        "headline_summary": headline_summary,
-        "event_context": event_context,
+        "event_name": values["event_name"],
+        "headline_summary": values["headline_summary"],
+        "event_context": values["event_context"],
         "market_impact": {
-            "sentiment": sentiment,
-            "macro_themes": macro_themes,
-            "sector_outlook": sector_outlook,
-            "horizon_impacts": horizon_impacts,
+            "sentiment": values["sentiment"],
+            "macro_themes": values["macro_themes"],
+            "sector_outlook": values["sector_outlook"],
+            "horizon_impacts": values["horizon_impacts"],
         },
-        "opportunities": opportunities,
-        "summary_insights": summary_insights,
-        "risk_note": risk_note,
-        "citations": citations,
+        "opportunities": values["opportunities"],
+        "summary_insights": values["summary_insights"],
+        "risk_note": values["risk_note"],
+        "citations": values["citations"],
     }
+
+
+def evaluate_sections(event_input: EventInput, sections: Sequence[Section] = MOCK_SECTIONS) -> Dict[str, object]:
+    values: Dict[str, object] = {field: getattr(event_input, field) for field in EVENT_FIELDS}
+    for section in sections:
+        values[section.name] = section.compute(*[values[name] for name in section.inputs])
+    return values
+
+
+def build_mock_report(event_input: EventInput) -> Dict[str, object]:
+    return assemble_mock_report(evaluate_sections(event_input))
+
+
+def _batch_chunksize(total: int, workers: int) -> int:
+    return max(1, -(-total // (workers * 4)))
+
+
+def build_mock_reports(
+    events: Iterable[EventInput],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> List[Dict[str, object]]:
+    event_list = list(events)
+    workers = min(workers or os.cpu_count() or 1, len(event_list))
+    if workers <= 1 or len(event_list) < PARALLEL_BATCH_THRESHOLD:
+        return [build_mock_report(event_input) for event_input in event_list]
+
+    # Imported here: multiprocessing is only needed for large batches.
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                build_mock_report,
+                event_list,
+                chunksize=chunksize or _batch_chunksize(len(event_list), workers),
+            )
+        )
@@ -0,0 +1,256 @@
+import argparse
+import csv
+import glob
+import io
+import json
+import os
+import sys
+import uuid
+from datetime import datetime
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+
+from report_cache import report_identity
+
+if TYPE_CHECKING:
+    import pyarrow
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+
+REPORT_COLUMNS = ("report_id", "event_name", "generated_at", "sentiment")
+OPPORTUNITY_COLUMNS = (
+    "ticker",
+    "company",
+    "sector",
+    "country",
+    "expected_direction",
+    "time_horizon",
+    "mechanism",
+    "investability_score",
+    "rationale",
+    "sources",
+)
+EXPORT_COLUMNS = REPORT_COLUMNS + OPPORTUNITY_COLUMNS
+
+Row = Tuple[object, ...]
+
+
+def _score(value: object) -> Optional[Union[int, float]]:
+    # Numbers pass through as the report has them, so CSV shows 7.5 rather than 7.
+    if type(value) is int or type(value) is float:
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_opportunity_rows(reports: Iterable[Dict[str, object]]) -> Iterator[Row]:
+    # One flat row per opportunity, prefixed with the keys of the report it came from.
+    for report in reports:
+        prefix = (
+            report_identity(report),
+            str(report.get("event_name", "")),
+            str(report.get("generated_at", "")),
+            str((report.get("market_impact") or {}).get("sentiment", "")),
+        )
+        for item in report.get("opportunities") or []:
+            yield prefix + (
+                str(item.get("ticker", "")),
+                str(item.get("company", "")),
+                str(item.get("sector", "")),
+                str(item.get("country", "")),
+                str(item.get("expected_direction", "")),
+                str(item.get("time_horizon", "")),
+                str(item.get("mechanism", "")),
+                _score(item.get("investability_score")),
+                str(item.get("rationale", "")),
+                "; ".join(str(source) for source in item.get("sources") or []),
+            )
+
+
+def iter_batches(rows: Iterable[Row], batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[Row]]:
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, max(1, batch_size)))
+        if not batch:
+            return
+        yield batch
+
+
+def write_csv_stream(
+    reports: Iterable[Dict[str, object]],
+    stream: TextIO,
+    header: bool = True,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> int:
+    writer = csv.writer(stream)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    written = 0
+    for batch in iter_batches(iter_opportunity_rows(reports), batch_size):
+        writer.writerows(batch)
+        written += len(batch)
+    return written
+
+
+def write_csv(
+    reports: Iterable[Dict[str, object]],
+    path: str,
+    append: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> int:
+    # Appending checks the existing header so a dataset never mixes column layouts.
+    existing = append and os.path.exists(path) and os.path.getsize(path) > 0
+    if existing:
+        with open(path, "r", encoding="utf-8", newline="") as handle:
+            found = next(csv.reader(handle), [])
+        if tuple(found) != EXPORT_COLUMNS:
+            raise ValueError(f"{path} has columns {found}, expected {list(EXPORT_COLUMNS)}")
+    with open(path, "a" if existing else "w", encoding="utf-8", newline="") as handle:
+        return write_csv_stream(reports, handle, header=not existing, batch_size=batch_size)
+
+
+def opportunities_csv(report: Dict[str, object]) -> str:
+    buffer = io.StringIO()
+    write_csv_stream([report], buffer)
+    return buffer.getvalue()
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from exc
+    return pyarrow
+
+
+def parquet_schema() -> "pyarrow.Schema":
+    pa = _pyarrow()
+    fields = [pa.field(name, pa.string()) for name in EXPORT_COLUMNS]
+    fields[EXPORT_COLUMNS.index("generated_at")] = pa.field("generated_at", pa.timestamp("us", tz="UTC"))
+    fields[EXPORT_COLUMNS.index("investability_score")] = pa.field("investability_score", pa.float64())
+    return pa.schema(fields)
+
+
+def _timestamp(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _record_batch(batch: Sequence[Row], schema: "pyarrow.Schema") -> "pyarrow.RecordBatch":
+    pa = _pyarrow()
+    columns = [list(column) for column in zip(*batch)]
+    position = EXPORT_COLUMNS.index("generated_at")
+    columns[position] = [_timestamp(value) for value in columns[position]]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema
+    )
+
+
+def write_parquet(
+    reports: Iterable[Dict[str, object]],
+    path: str,
+    append: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> int:
+    # `path` is a dataset directory. Every export writes one new part file with a
+    # row group per batch, so appending never rewrites what is already there.
+    pa = _pyarrow()
+    schema = parquet_schema()
+    os.makedirs(path, exist_ok=True)
+    parts = glob.glob(os.path.join(path, "part-*.parquet"))
+    if not append:
+        for stale in parts:
+            os.remove(stale)
+    elif parts:
+        # As with CSV, appending never mixes layouts, e.g. parts written when
+        # the score was an integer column.
+        found = pa.parquet.read_schema(parts[0])
+        if not found.equals(schema):
+            raise ValueError(f"{path} holds parts with a different schema; export without append to replace them")
+    target = os.path.join(path, f"part-{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.parquet")
+    partial = target + ".tmp"
+    written = 0
+    try:
+        with pa.parquet.ParquetWriter(partial, schema, compression="zstd") as writer:
+            for batch in iter_batches(iter_opportunity_rows(reports), batch_size):
+                writer.write_batch(_record_batch(batch, schema))
+                written += len(batch)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    if written:
+        os.replace(partial, target)
+    else:
+        os.remove(partial)
+    return written
+
+
+def export_format(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "parquet"
+
+
+def export_reports(
+    reports: Iterable[Dict[str, object]],
+    path: str,
+    fmt: Optional[str] = None,
+    append: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> int:
+    fmt = fmt or export_format(path)
+    if fmt == "csv":
+        return write_csv(reports, path, append, batch_size)
+    if fmt == "parquet":
+        return write_parquet(reports, path, append, batch_size)
+    raise ValueError(f"unknown export format {fmt!r}")
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, object]]:
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export opportunity rows from stored reports to CSV or Parquet.")
+    parser.add_argument("output", help="a .csv file, or a directory for a Parquet dataset")
+    parser.add_argument("--format", choices=("csv", "parquet"), help="defaults to csv for *.csv, parquet otherwise")
+    parser.add_argument("--append", action="store_true", help="add to an existing export instead of replacing it")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE, help="rows per write")
+    parser.add_argument("--jsonl", help="read reports from a JSONL file instead of the report history")
+    parser.add_argument("--history", help="report history database (defaults to REPORT_HISTORY_PATH)")
+    parser.add_argument("--event", help="event name prefix")
+    parser.add_argument("--ticker")
+    parser.add_argument("--sentiment")
+    parser.add_argument("--since", help="ISO timestamp, inclusive")
+    parser.add_argument("--until", help="ISO timestamp, exclusive")
+    args = parser.parse_args(argv)
+
+    if args.jsonl:
+        reports = read_jsonl(args.jsonl)
+    else:
+        from llm_client import REPORT_HISTORY
+        from report_history import ReportHistory
+
+        history = ReportHistory(args.history) if args.history else REPORT_HISTORY
+        filters = {
+            "event": args.event,
+            "ticker": args.ticker,
+            "sentiment": args.sentiment,
+            "since": args.since,
+            "until": args.until,
+        }
+        reports = history.iter_reports(**filters)
+    written = export_reports(reports, args.output, args.format, args.append, args.batch_size)
+    print(f"Wrote {written} opportunity rows to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
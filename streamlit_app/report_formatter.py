@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, TextIO
 
 
 def _escape_pipes(value: str) -> str:
@@ -24,60 +24,90 @@ def _format_opportunity_row(row: Dict[str, object]) -> str:
     return "| " + " | ".join(_escape_pipes(cell) for cell in cells) + " |"
 
 
-def format_report_as_markdown(report: Dict[str, object]) -> str:
-    lines: List[str] = []
-
-    lines.append("# Headline Summary")
-    lines.append(str(report["headline_summary"]).strip())
-    lines.append("")
+def _iter_markdown_lines(report: Dict[str, object]) -> Iterator[str]:
+    yield "# Headline Summary"
+    yield str(report["headline_summary"]).strip()
+    yield ""
 
     event_context = report["event_context"]
-    lines.append("## Event Context")
-    lines.append(str(event_context["overview"]).strip())
-    lines.append("")
-    lines.append(f"- **Timing:** {event_context['timing']}")
-    lines.append(f"- **Significance:** {event_context['significance']}")
+    yield "## Event Context"
+    yield str(event_context["overview"]).strip()
+    yield ""
+    yield f"- **Timing:** {event_context['timing']}"
+    yield f"- **Significance:** {event_context['significance']}"
     context_points = event_context.get("context_points", [])
     if context_points:
-        lines.append("- **Key Drivers:**")
+        yield "- **Key Drivers:**"
         for point in context_points:
-            lines.append(f"  - {point}")
-    lines.append("")
+            yield f"  - {point}"
+    yield ""
 
     market_impact = report["market_impact"]
-    lines.append("## Market Impact Analysis")
-    lines.append(f"- **Sentiment:** {market_impact['sentiment']}")
-    lines.append(f"- **Macro Themes:** {'; '.join(market_impact['macro_themes'])}")
-    lines.append(f"- **Sector Exposure:** {'; '.join(market_impact['sector_outlook'])}")
-    lines.append("- **Time Horizons:**")
+    yield "## Market Impact Analysis"
+    yield f"- **Sentiment:** {market_impact['sentiment']}"
+    yield f"- **Macro Themes:** {'; '.join(market_impact['macro_themes'])}"
+    yield f"- **Sector Exposure:** {'; '.join(market_impact['sector_outlook'])}"
+    yield "- **Time Horizons:**"
     for item in market_impact["horizon_impacts"]:
-        lines.append(f"  - {item['horizon']}: {item['outlook']}")
-    lines.append("")
+        yield f"  - {item['horizon']}: {item['outlook']}"
+    yield ""
 
-    lines.append("## Investment Opportunity Table")
-    lines.append("| Ticker | Company | Sector | Country | Expected Direction | Time Horizon | Mechanism of Impact | Investability Score | Rationale | Source(s) |")
-    lines.append("| --- | --- | --- | --- | --- | --- | --- | --- | --- | --- |")
+    yield "## Investment Opportunity Table"
+    yield "| Ticker | Company | Sector | Country | Expected Direction | Time Horizon | Mechanism of Impact | Investability Score | Rationale | Source(s) |"
+    yield "| --- | --- | --- | --- | --- | --- | --- | --- | --- | --- |"
     for row in report["opportunities"]:
-        lines.append(_format_opportunity_row(row))
-    lines.append("")
+        yield _format_opportunity_row(row)
+    yield ""
 
-    lines.append("## Summary Insights")
+    yield "## Summary Insights"
     for insight in report["summary_insights"]:
-        lines.append(f"- {insight}")
-    lines.append("")
+        yield f"- {insight}"
+    yield ""
 
-    lines.append("## Risk Note")
-    lines.append(str(report["risk_note"]).strip())
-    lines.append("")
+    yield "## Risk Note"
+    yield str(report["risk_note"]).strip()
+    yield ""
 
-    lines.append("## Citations")
+    yield "## Citations"
     for citation in report["citations"]:
-        lines.append(f"- {citation}")
-    lines.append("")
+        yield f"- {citation}"
+    yield ""
 
     generated_at = report.get("generated_at")
     if generated_at:
         dt = datetime.fromisoformat(generated_at)
-        lines.append(f"_Generated {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}_")
+        yield f"_Generated {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}_"
+
+
+def iter_report_markdown(report: Dict[str, object]) -> Iterator[str]:
+    # Lines are emitted as they are formatted; the newline goes in front of every
+    # line but the first so the joined output matches a "\n".join of all lines.
+    lines = _iter_markdown_lines(report)
+    for line in lines:
+        yield line
+        break
+    for line in lines:
+        yield "\n" + line
+
 
-    return "\n".join(lines)
+def write_report_markdown(report: Dict[str, object], stream: TextIO) -> None:
+    for chunk in iter_report_markdown(report):
+        stream.write(chunk)
+
+
+def write_reports_markdown(
+    reports: Iterable[Dict[str, object]],
+    stream: TextIO,
+    separator: str = "\n\n---\n\n",
+) -> int:
+    count = 0
+    for report in reports:
+        if count:
+            stream.write(separator)
+        write_report_markdown(report, stream)
+        count += 1
+    return count
+
+
+def format_report_as_markdown(report: Dict[str, object]) -> str:
+    return "".join(iter_report_markdown(report))
@@ -0,0 +1,248 @@
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from report_cache import report_identity
+
+# Rows are append-only; the body is stored as JSON text and only decoded by get().
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    identity TEXT NOT NULL UNIQUE,
+    event_name TEXT NOT NULL COLLATE NOCASE,
+    generated_at TEXT NOT NULL,
+    sentiment TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    opportunity_count INTEGER NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_event_name ON reports (event_name);
+CREATE INDEX IF NOT EXISTS reports_generated_at ON reports (generated_at);
+CREATE INDEX IF NOT EXISTS reports_sentiment ON reports (sentiment, generated_at);
+CREATE TABLE IF NOT EXISTS report_tickers (
+    ticker TEXT NOT NULL,
+    report_id INTEGER NOT NULL REFERENCES reports (id),
+    PRIMARY KEY (ticker, report_id)
+) WITHOUT ROWID;
+"""
+
+MMAP_BYTES = 256 * 1024 * 1024
+
+Cursor = Tuple[str, int]
+
+
+@dataclass(frozen=True)
+class ReportSummary:
+    id: int
+    event_name: str
+    generated_at: str
+    sentiment: str
+    outcome: str
+    opportunity_count: int
+
+    @property
+    def cursor(self) -> Cursor:
+        return self.generated_at, self.id
+
+
+def _like_prefix(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+class ReportHistory:
+    def __init__(self, path: Optional[str]) -> None:
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use so importing the client does not touch the disk.
+        if self._connection is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            # Page reads go through a memory map instead of copying pages into the heap.
+            connection.execute(f"PRAGMA mmap_size={MMAP_BYTES}")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _row(report: Dict[str, object], outcome: str) -> Tuple[Tuple[object, ...], List[str]]:
+        opportunities = report.get("opportunities") or []
+        tickers = sorted({str(item.get("ticker", "")) for item in opportunities if item.get("ticker")})
+        row = (
+            report_identity(report, timestamped=False),
+            str(report.get("event_name", "")),
+            str(report.get("generated_at", "")),
+            str((report.get("market_impact") or {}).get("sentiment", "")),
+            outcome,
+            len(opportunities),
+            json.dumps(report, ensure_ascii=False, default=str),
+        )
+        return row, tickers
+
+    def add_many(self, reports: Iterable[Tuple[Dict[str, object], str]]) -> int:
+        # One transaction per call; reports already stored (by content identity) are skipped.
+        if not self.enabled:
+            return 0
+        rows = [self._row(report, outcome) for report, outcome in reports]
+        added = 0
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    for row, tickers in rows:
+                        cursor = connection.execute(
+                            "INSERT OR IGNORE INTO reports "
+                            "(identity, event_name, generated_at, sentiment, outcome, opportunity_count, body) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            row,
+                        )
+                        if cursor.rowcount:
+                            added += 1
+                            connection.executemany(
+                                "INSERT OR IGNORE INTO report_tickers (ticker, report_id) VALUES (?, ?)",
+                                [(ticker, cursor.lastrowid) for ticker in tickers],
+                            )
+        except (OSError, sqlite3.Error):
+            return 0
+        return added
+
+    def add(self, report: Dict[str, object], outcome: str) -> bool:
+        return self.add_many([(report, outcome)]) == 1
+
+    def _where(
+        self,
+        event: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        ticker: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Tuple[List[str], List[object]]:
+        clauses: List[str] = []
+        params: List[object] = []
+        if event:
+            clauses.append("event_name LIKE ? ESCAPE '\\'")
+            params.append(_like_prefix(event))
+        if sentiment:
+            clauses.append("sentiment = ?")
+            params.append(sentiment)
+        if ticker:
+            clauses.append("id IN (SELECT report_id FROM report_tickers WHERE ticker = ?)")
+            params.append(ticker.upper())
+        if since:
+            clauses.append("generated_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("generated_at < ?")
+            params.append(until)
+        return clauses, params
+
+    def page(
+        self,
+        limit: int = 20,
+        before: Optional[Cursor] = None,
+        event: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        ticker: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[ReportSummary]:
+        # Newest first, keyset-paginated: pass the last summary's cursor as `before`
+        # for the next page. Only summary columns are read, never the bodies.
+        if not self.enabled:
+            return []
+        clauses, params = self._where(event, sentiment, ticker, since, until)
+        if before is not None:
+            clauses.append("(generated_at, id) < (?, ?)")
+            params.extend(before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = (
+            "SELECT id, event_name, generated_at, sentiment, outcome, opportunity_count FROM reports "
+            f"{where} ORDER BY generated_at DESC, id DESC LIMIT ?"
+        )
+        try:
+            with self._lock:
+                rows = self._connect().execute(query, (*params, limit)).fetchall()
+        except (OSError, sqlite3.Error):
+            return []
+        return [ReportSummary(*row) for row in rows]
+
+    def iter_summaries(self, page_size: int = 500, **filters: Optional[str]) -> Iterator[ReportSummary]:
+        before: Optional[Cursor] = None
+        while True:
+            page = self.page(limit=page_size, before=before, **filters)
+            yield from page
+            if len(page) < page_size:
+                return
+            before = page[-1].cursor
+
+    def iter_reports(self, page_size: int = 200, **filters: Optional[str]) -> Iterator[Dict[str, object]]:
+        # Full bodies, newest first, one keyset page in memory at a time.
+        if not self.enabled:
+            return
+        clauses, params = self._where(**filters)
+        before: Optional[Cursor] = None
+        while True:
+            page_clauses = list(clauses)
+            page_params = list(params)
+            if before is not None:
+                page_clauses.append("(generated_at, id) < (?, ?)")
+                page_params.extend(before)
+            where = f"WHERE {' AND '.join(page_clauses)}" if page_clauses else ""
+            query = f"SELECT generated_at, id, body FROM reports {where} ORDER BY generated_at DESC, id DESC LIMIT ?"
+            try:
+                with self._lock:
+                    rows = self._connect().execute(query, (*page_params, page_size)).fetchall()
+            except (OSError, sqlite3.Error):
+                return
+            for _, _, body in rows:
+                yield json.loads(body)
+            if len(rows) < page_size:
+                return
+            before = rows[-1][0], rows[-1][1]
+
+    def count(
+        self,
+        event: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        ticker: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> int:
+        if not self.enabled:
+            return 0
+        clauses, params = self._where(event, sentiment, ticker, since, until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        try:
+            with self._lock:
+                return self._connect().execute(f"SELECT COUNT(*) FROM reports {where}", params).fetchone()[0]
+        except (OSError, sqlite3.Error):
+            return 0
+
+    def get(self, report_id: int) -> Optional[Dict[str, object]]:
+        if not self.enabled:
+            return None
+        try:
+            with self._lock:
+                row = self._connect().execute("SELECT body FROM reports WHERE id = ?", (report_id,)).fetchone()
+        except (OSError, sqlite3.Error):
+            return None
+        return json.loads(row[0]) if row else None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
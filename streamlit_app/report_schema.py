@@ -0,0 +1,420 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+Path = Tuple[object, ...]
+Checker = Callable[[object, List["SchemaIssue"], Path, object], object]
+Inline = Tuple[str, str, Dict[str, object]]
+
+HORIZON_LABELS = ("Short-term (0–3 months)", "Medium-term (3–12 months)", "Long-term (1–5 years)")
+DIRECTIONS = ("Bullish", "Bearish", "Neutral")
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class SchemaIssue:
+    path: str
+    code: str
+    message: str
+
+
+class SchemaError(ValueError):
+    def __init__(self, issues: Sequence[SchemaIssue]) -> None:
+        self.issues = list(issues)
+        super().__init__("; ".join(f"{issue.path}: {issue.message}" for issue in self.issues))
+
+
+def _format_path(path: Path) -> str:
+    text = "$"
+    for part in path:
+        text += f"[{part}]" if isinstance(part, int) else f".{part}"
+    return text
+
+
+def _issue(issues: List[SchemaIssue], path: Path, key: object, code: str, message: str) -> None:
+    issues.append(SchemaIssue(_format_path(path + (key,)), code, message))
+
+
+# Schema nodes render themselves in the notation SYSTEM_PROMPT uses and compile to
+# checkers called as check(value, issues, parent_path, key). Paths are only built
+# when an issue is recorded or a container is entered. Leaf nodes may also offer
+# an inline (condition, expression) pair over "v" that Record compiles into its
+# generated checker as the fast path.
+class Text:
+    def __init__(self, default: str = "", upper: bool = False) -> None:
+        self.default = default
+        self.upper = upper
+
+    def render(self, indent: str) -> str:
+        return "string"
+
+    def inline(self, ref: str) -> Inline:
+        return "type(v) is str", "v.upper()" if self.upper else "v", {}
+
+    def compile(self) -> Checker:
+        default = self.default
+        upper = self.upper
+
+        def check(value, issues, path, key):
+            if type(value) is not str:
+                if value is _MISSING or value is None:
+                    _issue(issues, path, key, "missing", "expected a string")
+                    return default
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    _issue(issues, path, key, "coerced", f"converted {type(value).__name__} to string")
+                    value = str(value)
+                else:
+                    _issue(issues, path, key, "type", f"expected a string, got {type(value).__name__}")
+                    return default
+            return value.upper() if upper else value
+
+        return check
+
+
+class Choice:
+    def __init__(self, options: Sequence[str], default: str, keywords: Optional[Dict[str, str]] = None) -> None:
+        self.options = tuple(options)
+        self.default = default
+        self.keywords = dict(keywords or {})
+
+    def render(self, indent: str) -> str:
+        return "|".join(f'"{option}"' for option in self.options)
+
+    def inline(self, ref: str) -> Inline:
+        return f"type(v) is str and v in {ref}", "v", {ref: frozenset(self.options)}
+
+    def compile(self) -> Checker:
+        options = frozenset(self.options)
+        folded = {option.casefold(): option for option in self.options}
+        keywords = tuple(self.keywords.items())
+        default = self.default
+
+        # Models repeat the same off-schema spellings across items, so matches are memoised.
+        memo: Dict[str, Optional[str]] = {}
+
+        def match(value: str) -> Optional[str]:
+            if value in memo:
+                return memo[value]
+            option = folded.get(value.strip().casefold())
+            if option is None:
+                lowered = value.lower()
+                option = next((label for keyword, label in keywords if keyword in lowered), None)
+            if len(memo) < 1024:
+                memo[value] = option
+            return option
+
+        def check(value, issues, path, key):
+            if type(value) is str:
+                if value in options:
+                    return value
+                option = match(value)
+                if option is not None:
+                    return option
+                _issue(issues, path, key, "choice", f"{value!r} is not one of {', '.join(self.options)}")
+            elif value is _MISSING or value is None:
+                _issue(issues, path, key, "missing", "expected one of " + ", ".join(self.options))
+            else:
+                _issue(issues, path, key, "type", f"expected a string, got {type(value).__name__}")
+            return default
+
+        check.match = match
+        return check
+
+
+class Number:
+    def __init__(self, minimum: float, maximum: float, default: float) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.default = default
+
+    def render(self, indent: str) -> str:
+        return f"number ({self.minimum:g}-{self.maximum:g})"
+
+    def inline(self, ref: str) -> Inline:
+        return f"(type(v) is int or type(v) is float) and {self.minimum!r} <= v <= {self.maximum!r}", "v", {}
+
+    def compile(self) -> Checker:
+        minimum, maximum, default = self.minimum, self.maximum, self.default
+
+        def check(value, issues, path, key):
+            kind = type(value)
+            if kind is not int and kind is not float:
+                if value is _MISSING or value is None:
+                    _issue(issues, path, key, "missing", "expected a number")
+                    return default
+                try:
+                    value = float(value) if kind is str else None
+                except ValueError:
+                    value = None
+                if value is None or value != value:
+                    _issue(issues, path, key, "type", f"expected a number, got {kind.__name__}")
+                    return default
+                value = int(value) if value.is_integer() else value
+                _issue(issues, path, key, "coerced", "converted string to number")
+            if value < minimum or value > maximum:
+                _issue(issues, path, key, "range", f"{value} outside {minimum:g}-{maximum:g}")
+                return minimum if value < minimum else maximum
+            return value
+
+        return check
+
+
+class TextList:
+    def __init__(self, min_items: int = 0, max_items: Optional[int] = None) -> None:
+        self.min_items = min_items
+        self.max_items = max_items
+
+    def render(self, indent: str) -> str:
+        if self.max_items is None:
+            return "string[]"
+        if self.min_items == self.max_items:
+            return f"string[{self.max_items}]"
+        return f"string[{self.min_items}..{self.max_items}]"
+
+    def compile(self) -> Checker:
+        item_check = Text().compile()
+        min_items, max_items = self.min_items, self.max_items
+
+        def check(value, issues, path, key):
+            if type(value) is not list:
+                if value is _MISSING or value is None:
+                    _issue(issues, path, key, "missing", "expected a list of strings")
+                    return []
+                if type(value) is not str:
+                    _issue(issues, path, key, "type", f"expected a list, got {type(value).__name__}")
+                    return []
+                _issue(issues, path, key, "coerced", "wrapped a single string in a list")
+                value = [value]
+            for item in value:
+                if type(item) is not str:
+                    # Slow path only once a non-string shows up.
+                    own = path + (key,)
+                    items = []
+                    for index, entry in enumerate(value):
+                        if type(entry) is str:
+                            items.append(entry)
+                        elif entry is not None and not isinstance(entry, (dict, list)):
+                            items.append(item_check(entry, issues, own, index))
+                        else:
+                            _issue(issues, own, index, "type", "dropped a non-string item")
+                    break
+            else:
+                items = list(value)
+            if max_items is not None and len(items) > max_items:
+                _issue(issues, path, key, "length", f"truncated {len(items)} items to {max_items}")
+                del items[max_items:]
+            if len(items) < min_items:
+                _issue(issues, path, key, "length", f"expected at least {min_items} items, got {len(items)}")
+            return items
+
+        return check
+
+
+class Record:
+    def __init__(self, fields: Dict[str, object]) -> None:
+        self.fields = fields
+
+    def render(self, indent: str) -> str:
+        inner = indent + "  "
+        lines = [f'{inner}"{name}": {node.render(inner)}' for name, node in self.fields.items()]
+        return "{\n" + ",\n".join(lines) + "\n" + indent + "}"
+
+    def compile(self) -> Checker:
+        # Generates one function per record type with each field's fast path
+        # inlined, so a valid field costs a type check rather than a call.
+        namespace: Dict[str, object] = {"_MISSING": _MISSING, "_not_object": _not_object}
+        lines = [
+            "def check(value, issues, path, key):",
+            "    if type(value) is not dict:",
+            "        value = _not_object(value, issues, path, key)",
+            "    own = path + (key,) if key is not None else path",
+            "    get = value.get",
+        ]
+        results = []
+        for index, (name, node) in enumerate(self.fields.items()):
+            checker = f"_check{index}"
+            namespace[checker] = node.compile()
+            lines.append(f"    v = get({name!r}, _MISSING)")
+            inline = getattr(node, "inline", None)
+            if inline is None:
+                lines.append(f"    f{index} = {checker}(v, issues, own, {name!r})")
+            else:
+                condition, expression, constants = inline(f"_const{index}")
+                namespace.update(constants)
+                lines.append(f"    f{index} = {expression} if {condition} else {checker}(v, issues, own, {name!r})")
+            results.append(f"{name!r}: f{index}")
+        lines.append("    return {" + ", ".join(results) + "}")
+        exec("\n".join(lines), namespace)
+        return namespace["check"]
+
+
+def _not_object(value: object, issues: List[SchemaIssue], path: Path, key: object) -> Dict[str, object]:
+    if value is _MISSING or value is None:
+        _issue(issues, path, key, "missing", "expected an object")
+    else:
+        _issue(issues, path, key, "type", f"expected an object, got {type(value).__name__}")
+    return {}
+
+
+class RecordList:
+    def __init__(self, item: Record) -> None:
+        self.item = item
+
+    def render(self, indent: str) -> str:
+        inner = indent + "  "
+        return "[\n" + inner + self.item.render(inner) + "\n" + indent + "]"
+
+    def compile(self) -> Checker:
+        item_check = self.item.compile()
+
+        def check(value, issues, path, key):
+            if type(value) is not list:
+                if value is _MISSING or value is None:
+                    _issue(issues, path, key, "missing", "expected a list of objects")
+                else:
+                    _issue(issues, path, key, "type", f"expected a list, got {type(value).__name__}")
+                return []
+            own = path + (key,)
+            results = []
+            for index, item in enumerate(value):
+                if type(item) is dict:
+                    results.append(item_check(item, issues, own, index))
+                else:
+                    _issue(issues, own, index, "type", f"dropped a non-object item ({type(item).__name__})")
+            return results
+
+        return check
+
+
+class HorizonTable:
+    # A fixed row per label, in label order, whatever order or spelling the model used.
+    def __init__(self, labels: Sequence[str], keywords: Dict[str, str]) -> None:
+        self.labels = tuple(labels)
+        self.keywords = keywords
+
+    def render(self, indent: str) -> str:
+        inner = indent + "  "
+        rows = [f'{inner}{{"horizon": "{label}", "outlook": string}}' for label in self.labels]
+        return "[\n" + ",\n".join(rows) + "\n" + indent + "]"
+
+    def compile(self) -> Checker:
+        labels = self.labels
+        match = Choice(labels, labels[0], self.keywords).compile().match
+        outlook_check = Text().compile()
+
+        def check(value, issues, path, key):
+            own = path + (key,)
+            outlooks: Dict[str, object] = {}
+            if type(value) is list:
+                for index, row in enumerate(value):
+                    horizon = row.get("horizon") if type(row) is dict else None
+                    label = horizon if horizon in labels else match(horizon) if type(horizon) is str else None
+                    if label is None:
+                        _issue(issues, own, index, "choice", f"unrecognised horizon {horizon!r}")
+                    elif label not in outlooks:
+                        outlooks[label] = outlook_check(row.get("outlook", _MISSING), issues, own + (index,), "outlook")
+            elif value is not _MISSING and value is not None:
+                _issue(issues, path, key, "type", f"expected a list, got {type(value).__name__}")
+            else:
+                _issue(issues, path, key, "missing", "expected a list of horizon rows")
+            rows = []
+            for label in labels:
+                if label not in outlooks:
+                    _issue(issues, own, label, "missing", "no outlook for this horizon")
+                rows.append({"horizon": label, "outlook": outlooks.get(label, "")})
+            return rows
+
+        return check
+
+
+HORIZON_KEYWORDS = {"short": HORIZON_LABELS[0], "medium": HORIZON_LABELS[1], "long": HORIZON_LABELS[2]}
+
+OPPORTUNITY_SCHEMA = Record(
+    {
+        "ticker": Text(upper=True),
+        "company": Text(),
+        "sector": Text(),
+        "country": Text(),
+        "expected_direction": Choice(DIRECTIONS, "Neutral"),
+        "time_horizon": Choice(HORIZON_LABELS, HORIZON_LABELS[1], HORIZON_KEYWORDS),
+        "mechanism": Text(),
+        "investability_score": Number(1, 10, 5),
+        "rationale": Text(),
+        "sources": TextList(),
+    }
+)
+
+REPORT_SCHEMA = Record(
+    {
+        "headline_summary": Text(),
+        "event_context": Record(
+            {
+                "overview": Text(),
+                "timing": Text(),
+                "significance": Text(),
+                "context_points": TextList(1, 4),
+            }
+        ),
+        "market_impact": Record(
+            {
+                "sentiment": Choice(DIRECTIONS, "Neutral"),
+                "macro_themes": TextList(1, 6),
+                "sector_outlook": TextList(1, 5),
+                "horizon_impacts": HorizonTable(HORIZON_LABELS, HORIZON_KEYWORDS),
+            }
+        ),
+        "opportunities": RecordList(OPPORTUNITY_SCHEMA),
+        "summary_insights": TextList(1, 5),
+        "risk_note": Text(),
+        "citations": TextList(3, 3),
+    }
+)
+
+
+def render_schema(schema: Record = REPORT_SCHEMA) -> str:
+    return schema.render("")
+
+
+def subschema(schema: Record, paths: Sequence[str]) -> Record:
+    # The part of a record covering the given dotted field paths, in schema order.
+    wanted: Dict[str, List[str]] = {}
+    whole = set()
+    for path in paths:
+        head, _, rest = path.partition(".")
+        if head not in schema.fields:
+            raise KeyError(path)
+        wanted.setdefault(head, []).append(rest)
+        if not rest:
+            whole.add(head)
+    fields: Dict[str, object] = {}
+    for name, node in schema.fields.items():
+        if name in whole or (name in wanted and not isinstance(node, (Record, RecordList))):
+            fields[name] = node
+        elif isinstance(node, RecordList) and name in wanted:
+            fields[name] = RecordList(subschema(node.item, wanted[name]))
+        elif name in wanted:
+            fields[name] = subschema(node, wanted[name])
+    return Record(fields)
+
+
+class Validator:
+    def __init__(self, schema: Record) -> None:
+        self.schema = schema
+        self._check = schema.compile()
+        self._check_items = RecordList(schema).compile()
+
+    def validate(self, raw: object) -> Tuple[Dict[str, object], List[SchemaIssue]]:
+        # Coerces what it can and reports everything it changed; only a
+        # non-object root is unrecoverable.
+        if type(raw) is not dict:
+            raise SchemaError([SchemaIssue("$", "type", f"expected an object, got {type(raw).__name__}")])
+        issues: List[SchemaIssue] = []
+        return self._check(raw, issues, (), None), issues
+
+    def validate_items(self, raw: object) -> Tuple[List[Dict[str, object]], List[SchemaIssue]]:
+        issues: List[SchemaIssue] = []
+        return self._check_items(raw, issues, (), "items"), issues
+
+
+REPORT_VALIDATOR = Validator(REPORT_SCHEMA)
+OPPORTUNITY_VALIDATOR = Validator(OPPORTUNITY_SCHEMA)
@@ -0,0 +1,359 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar, Union
+
+from metrics import BREAKER_TRANSITIONS, LLM_HEDGES, LLM_RETRIES, RequestTrace
+
+T = TypeVar("T")
+ErrorTypes = Tuple[Type[BaseException], ...]
+
+
+class BudgetExceeded(TimeoutError):
+    pass
+
+
+class AttemptTimeout(TimeoutError):
+    pass
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class LatencyBudget:
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self) -> float:
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise BudgetExceeded(f"latency budget of {self.seconds:g}s exhausted")
+        return remaining
+
+
+class RetryPolicy:
+    def __init__(self, attempts: int = 3, base_delay: float = 0.5, max_delay: float = 4.0) -> None:
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        # Full jitter keeps concurrent clients from retrying in lockstep.
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            self.state = state
+            BREAKER_TRANSITIONS.inc(state=state)
+
+    def allow(self) -> bool:
+        # While open, calls are refused until reset_seconds pass; then a single
+        # probe is let through and its outcome closes or re-opens the breaker.
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self._transition(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.failure_threshold > 0 and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self._probing = False
+                self._transition(self.OPEN)
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 200) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float, min_samples: int) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class Resilience:
+    def __init__(
+        self,
+        budget_seconds: float,
+        retry: RetryPolicy,
+        breaker: CircuitBreaker,
+        retryable: Union[ErrorTypes, Callable[[], ErrorTypes]] = (),
+        attempt_seconds: Optional[float] = None,
+        hedge_percentile: float = 0.0,
+        hedge_min_samples: int = 20,
+        min_attempt_seconds: float = 1.0,
+        max_workers: int = 16,
+    ) -> None:
+        self.budget_seconds = budget_seconds
+        self.retry = retry
+        self.breaker = breaker
+        # A callable is resolved on the first failure, so client libraries that
+        # define the error types need not be imported up front.
+        self._retryable = retryable
+        self.attempt_seconds = attempt_seconds
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.min_attempt_seconds = min_attempt_seconds
+        # One tracker per kind of call, so a hedge only compares like with like.
+        self.latencies: Dict[str, LatencyTracker] = {}
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def retryable(self) -> ErrorTypes:
+        if callable(self._retryable):
+            self._retryable = self._retryable()
+        return (AttemptTimeout, *self._retryable)
+
+    def budget(self, seconds: Optional[float] = None) -> LatencyBudget:
+        return LatencyBudget(self.budget_seconds if seconds is None else seconds)
+
+    def _tracker(self, kind: str) -> LatencyTracker:
+        with self._lock:
+            return self.latencies.setdefault(kind, LatencyTracker())
+
+    def hedge_delay(self, kind: str = "report") -> Optional[float]:
+        if self.hedge_percentile <= 0:
+            return None
+        return self._tracker(kind).quantile(self.hedge_percentile, self.hedge_min_samples)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="llm-call")
+            return self._executor
+
+    @staticmethod
+    def _timed(fn: Callable[[float], T], timeout: float, tracker: Optional[LatencyTracker]) -> T:
+        started = time.perf_counter()
+        result = fn(timeout)
+        if tracker is not None:
+            tracker.observe(time.perf_counter() - started)
+        return result
+
+    def _deadline(self, budget: LatencyBudget) -> Tuple[float, float]:
+        remaining = budget.check()
+        if self.attempt_seconds is None or self.attempt_seconds >= remaining:
+            return remaining, budget.deadline
+        return self.attempt_seconds, time.monotonic() + self.attempt_seconds
+
+    def _timeout_error(self, budget: LatencyBudget, deadline: float) -> TimeoutError:
+        if deadline < budget.deadline:
+            return AttemptTimeout(f"no response within {self.attempt_seconds:g}s")
+        return BudgetExceeded(f"no response within the {budget.seconds:g}s latency budget")
+
+    def _attempt(
+        self, fn: Callable[[float], T], budget: LatencyBudget, kind: Optional[str], trace: RequestTrace
+    ) -> T:
+        # Calls run on a pool so the caller can walk away when the attempt or
+        # budget runs out; the timeout handed to fn bounds how long an
+        # abandoned call lingers.
+        timeout, deadline = self._deadline(budget)
+        pool = self._pool()
+        # Only hedged calls are timed: the others (a stream's first byte, say)
+        # would drag the percentile down and hedge every full call.
+        tracker = self._tracker(kind) if kind is not None else None
+        futures: List[Future] = [pool.submit(self._timed, fn, timeout, tracker)]
+        hedge_after = self.hedge_delay(kind) if kind is not None else None
+        if hedge_after is not None and hedge_after < timeout:
+            done, _ = wait(futures, hedge_after)
+            if not done:
+                LLM_HEDGES.inc()
+                trace.event("hedge")
+                futures.append(pool.submit(self._timed, fn, max(0.0, deadline - time.monotonic()), tracker))
+        error: Optional[BaseException] = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                raise self._timeout_error(budget, deadline)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def _record(self, exc: BaseException) -> None:
+        # Only timeouts and transient upstream errors count against the breaker.
+        # A client error (a 400 or 422) still means the upstream answered.
+        if isinstance(exc, (TimeoutError, *self.retryable)):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def _next_delay(self, attempt: int, exc: BaseException, budget: LatencyBudget, trace: RequestTrace) -> float:
+        self._record(exc)
+        if not isinstance(exc, self.retryable) or attempt + 1 >= self.retry.attempts:
+            raise exc
+        delay = self.retry.delay(attempt)
+        if budget.remaining() - delay < self.min_attempt_seconds:
+            raise exc
+        if not self.breaker.allow():
+            # Surface the failure that tripped the breaker rather than the breaker itself.
+            trace.event("circuit_open")
+            raise exc
+        LLM_RETRIES.inc()
+        trace.event(f"retry:{attempt + 1}:{type(exc).__name__}")
+        return delay
+
+    def call(
+        self,
+        fn: Callable[[float], T],
+        budget: Optional[LatencyBudget] = None,
+        hedge: bool = True,
+        trace: Optional[RequestTrace] = None,
+        inline: bool = False,
+        kind: str = "report",
+    ) -> T:
+        # fn receives the seconds left in the budget and should use them as its own timeout.
+        # inline runs each attempt on the calling thread instead of the shared pool,
+        # bounded by that timeout alone and never hedged; it is for callers that
+        # already have a thread of their own, so they do not queue behind others.
+        # kind names the tracker hedged calls are timed against.
+        budget = budget or self.budget()
+        trace = trace or RequestTrace()
+        if not self.breaker.allow():
+            trace.event("circuit_open")
+            raise CircuitOpenError("upstream circuit is open after repeated failures")
+        attempt = 0
+        while True:
+            try:
+                if inline:
+                    result = fn(self._deadline(budget)[0])
+                else:
+                    result = self._attempt(fn, budget, kind if hedge else None, trace)
+            except Exception as exc:
+                time.sleep(self._next_delay(attempt, exc, budget, trace))
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def _aattempt(
+        self, fn: Callable[[float], Awaitable[T]], budget: LatencyBudget, kind: Optional[str], trace: RequestTrace
+    ) -> T:
+        tracker = self._tracker(kind) if kind is not None else None
+
+        async def timed(timeout: float) -> T:
+            started = time.perf_counter()
+            result = await fn(timeout)
+            if tracker is not None:
+                tracker.observe(time.perf_counter() - started)
+            return result
+
+        timeout, deadline = self._deadline(budget)
+        tasks = [asyncio.ensure_future(timed(timeout))]
+        try:
+            hedge_after = self.hedge_delay(kind) if kind is not None else None
+            if hedge_after is not None and hedge_after < timeout:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+                if not done:
+                    LLM_HEDGES.inc()
+                    trace.event("hedge")
+                    tasks.append(asyncio.ensure_future(timed(max(0.0, deadline - time.monotonic()))))
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0.0, deadline - time.monotonic()), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise self._timeout_error(budget, deadline)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def acall(
+        self,
+        fn: Callable[[float], Awaitable[T]],
+        budget: Optional[LatencyBudget] = None,
+        hedge: bool = True,
+        trace: Optional[RequestTrace] = None,
+        kind: str = "report",
+    ) -> T:
+        budget = budget or self.budget()
+        trace = trace or RequestTrace()
+        if not self.breaker.allow():
+            trace.event("circuit_open")
+            raise CircuitOpenError("upstream circuit is open after repeated failures")
+        attempt = 0
+        while True:
+            try:
+                result = await self._aattempt(fn, budget, kind if hedge else None, trace)
+            except Exception as exc:
+                await asyncio.sleep(self._next_delay(attempt, exc, budget, trace))
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    def stream(self, chunks: Iterable[T], budget: LatencyBudget) -> Iterator[T]:
+        # Streams outlive call(), so the budget is checked per chunk and a
+        # broken or stalled stream still counts against the breaker.
+        try:
+            for chunk in chunks:
+                budget.check()
+                yield chunk
+        except Exception as exc:
+            self._record(exc)
+            raise
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            kinds = list(self.latencies)
+        return {
+            "state": self.breaker.state,
+            "failures": self.breaker.failures,
+            "hedge_after": {kind: self.hedge_delay(kind) for kind in kinds},
+        }
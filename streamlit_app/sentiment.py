@@ -0,0 +1,69 @@
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Tuple
+
+Sentiment = str
+SentimentScore = Tuple[Sentiment, float]
+
+# Inflections accepted after any lexicon term ("sanction" also matches "sanctions").
+_SUFFIX = r"(?:s|es)?"
+_SEPARATOR = "\x00"
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    # A character trie rendered as nested groups keeps the regex engine from
+    # retrying every alternative at each position, so cost grows with text
+    # length rather than with lexicon size.
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _render(node: Dict[str, dict]) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + _render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+
+    return _render(trie)
+
+
+class SentimentLexicon:
+    def __init__(self, weights: Dict[str, float]) -> None:
+        self.weights = {term.strip().lower(): weight for term, weight in weights.items() if term.strip()}
+        self.pattern = re.compile(rf"\b({_trie_pattern(self.weights)}){_SUFFIX}\b")
+
+    @staticmethod
+    def label(score: float) -> Sentiment:
+        if score > 0:
+            return "Bullish"
+        if score < 0:
+            return "Bearish"
+        return "Neutral"
+
+    def score(self, text: str) -> SentimentScore:
+        weights = self.weights
+        total = sum((weights[match.group(1)] for match in self.pattern.finditer(text.lower())), 0.0)
+        return self.label(total), total
+
+    def score_many(self, texts: Iterable[str]) -> List[SentimentScore]:
+        # Scan all texts as one buffer and attribute matches back by offset,
+        # so a large batch costs one regex pass instead of one per text.
+        lowered = [text.lower() for text in texts]
+        starts: List[int] = []
+        offset = 0
+        for text in lowered:
+            starts.append(offset)
+            offset += len(text) + 1
+        totals = [0.0] * len(lowered)
+        weights = self.weights
+        buffer = _SEPARATOR.join(lowered)
+        for match in self.pattern.finditer(buffer):
+            totals[bisect_right(starts, match.start()) - 1] += weights[match.group(1)]
+        return [(self.label(total), total) for total in totals]
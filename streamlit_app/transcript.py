@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+TRANSCRIPT_MAX_MESSAGES = int(os.getenv("TRANSCRIPT_MAX_MESSAGES", "20"))
+TRANSCRIPT_DIR = os.getenv("TRANSCRIPT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".transcripts"))
+TRANSCRIPT_SPILL_TTL = float(os.getenv("TRANSCRIPT_SPILL_TTL", str(7 * 24 * 3600)))
+
+Message = Dict[str, str]
+
+
+def prune_spills(directory: str, max_age: float) -> int:
+    # Sessions never say goodbye, so stale spill files are swept when a new one starts.
+    removed = 0
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.name.endswith(".jsonl") and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+class Transcript:
+    # A ring buffer of the most recent messages. Messages pushed out of it are
+    # appended to a per-session JSONL file and read back a page at a time.
+    def __init__(
+        self,
+        max_messages: int = TRANSCRIPT_MAX_MESSAGES,
+        directory: Optional[str] = TRANSCRIPT_DIR,
+        session_id: Optional[str] = None,
+    ) -> None:
+        self.recent: Deque[Message] = deque(maxlen=max(1, max_messages))
+        self.directory = directory
+        self.session_id = session_id or uuid.uuid4().hex
+        self.spilled = 0
+        self._offsets: List[int] = []
+        self._size = 0
+        self._lock = threading.Lock()
+        if directory:
+            prune_spills(directory, TRANSCRIPT_SPILL_TTL)
+
+    @property
+    def path(self) -> Optional[str]:
+        return os.path.join(self.directory, f"{self.session_id}.jsonl") if self.directory else None
+
+    def __len__(self) -> int:
+        return self.spilled + len(self.recent)
+
+    def _spill(self, message: Message) -> None:
+        line = (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path, "ab") as handle:
+                handle.write(line)
+        except OSError:
+            # Without a writable directory older turns are dropped rather than kept in memory.
+            return
+        self._offsets.append(self._size)
+        self._size += len(line)
+        self.spilled += 1
+
+    def append(self, role: str, content: str) -> None:
+        with self._lock:
+            if len(self.recent) == self.recent.maxlen:
+                evicted = self.recent.popleft()
+                if self.path:
+                    self._spill(evicted)
+            self.recent.append({"role": role, "content": content})
+
+    def older(self, count: int) -> List[Message]:
+        # The `count` spilled messages just before the in-memory window, oldest first.
+        with self._lock:
+            count = min(count, len(self._offsets))
+            if count <= 0:
+                return []
+            start = self._offsets[-count]
+            try:
+                with open(self.path, "rb") as handle:
+                    handle.seek(start)
+                    data = handle.read(self._size - start)
+            except OSError:
+                return []
+        return [json.loads(line) for line in data.splitlines()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.recent.clear()
+            self._offsets.clear()
+            self._size = 0
+            self.spilled = 0
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
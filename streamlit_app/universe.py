@@ -0,0 +1,147 @@
+import re
+from array import array
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from relevance import RelevanceIndex
+
+CompiledTemplate = Callable[[Dict[str, str]], str]
+RowIds = Tuple[int, ...]
+Criterion = Optional[Union[str, Iterable[str]]]
+
+PLACEHOLDER_PATTERN = re.compile(r"{{(.*?)}}")
+
+STRING_COLUMNS = ("ticker", "company", "sector", "country", "expected_direction", "time_horizon")
+INDEXED_COLUMNS = ("sector", "country", "expected_direction", "time_horizon")
+
+
+@lru_cache(maxsize=4096)
+def compile_template(template: str) -> CompiledTemplate:
+    parts = PLACEHOLDER_PATTERN.split(template)
+    literals = tuple(parts[0::2])
+    keys = tuple(key.strip() for key in parts[1::2])
+    if not keys:
+        return lambda replacements: template
+    if len(keys) == 1:
+        # Every shipped template has a single placeholder; plain concatenation
+        # is several times cheaper than a regex pass or str.format.
+        head, tail = literals
+        key = keys[0]
+        return lambda replacements: head + replacements.get(key, "") + tail
+
+    def _render(replacements: Dict[str, str]) -> str:
+        pieces = [literals[0]]
+        for key, literal in zip(keys, literals[1:]):
+            pieces.append(replacements.get(key, ""))
+            pieces.append(literal)
+        return "".join(pieces)
+
+    return _render
+
+
+class OpportunityUniverse:
+    def __init__(
+        self,
+        columns: Dict[str, Tuple[str, ...]],
+        investability_scores: array,
+        sources: Tuple[List[str], ...],
+        mechanism_templates: Tuple[str, ...],
+        rationale_templates: Tuple[str, ...],
+    ) -> None:
+        self.columns = columns
+        self.investability_scores = investability_scores
+        self.sources = sources
+        self.mechanism_templates = mechanism_templates
+        self.rationale_templates = rationale_templates
+        self.mechanisms: Tuple[CompiledTemplate, ...] = tuple(compile_template(text) for text in mechanism_templates)
+        self.rationales: Tuple[CompiledTemplate, ...] = tuple(compile_template(text) for text in rationale_templates)
+        self.indexes: Dict[str, Dict[str, RowIds]] = {name: self._build_index(columns[name]) for name in INDEXED_COLUMNS}
+        self._relevance: Optional["RelevanceIndex"] = None
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, object]]) -> "OpportunityUniverse":
+        values: Dict[str, List[str]] = {name: [] for name in STRING_COLUMNS}
+        scores = array("h")
+        sources: List[List[str]] = []
+        mechanisms: List[str] = []
+        rationales: List[str] = []
+        for record in records:
+            for name in STRING_COLUMNS:
+                values[name].append(str(record[name]))
+            scores.append(int(record["investability_score"]))
+            sources.append(list(record.get("sources", [])))
+            mechanisms.append(str(record["mechanism_template"]))
+            rationales.append(str(record["rationale_template"]))
+        return cls(
+            {name: tuple(column) for name, column in values.items()},
+            scores,
+            tuple(sources),
+            tuple(mechanisms),
+            tuple(rationales),
+        )
+
+    @staticmethod
+    def _build_index(column: Sequence[str]) -> Dict[str, RowIds]:
+        buckets: Dict[str, List[int]] = {}
+        for row, value in enumerate(column):
+            buckets.setdefault(value, []).append(row)
+        return {value: tuple(rows) for value, rows in buckets.items()}
+
+    def __len__(self) -> int:
+        return len(self.investability_scores)
+
+    @property
+    def relevance(self) -> "RelevanceIndex":
+        # Built on first use so importing the engine does not pull in NumPy.
+        if self._relevance is None:
+            from relevance import RelevanceIndex
+
+            self._relevance = RelevanceIndex(self)
+        return self._relevance
+
+    def values(self, column: str) -> List[str]:
+        return list(self.indexes[column])
+
+    def _lookup(self, column: str, criterion: Union[str, Iterable[str]]) -> RowIds:
+        index = self.indexes[column]
+        if isinstance(criterion, str):
+            return index.get(criterion, ())
+        rows: List[int] = []
+        for value in criterion:
+            rows.extend(index.get(value, ()))
+        return tuple(sorted(rows))
+
+    def query(
+        self,
+        sector: Criterion = None,
+        country: Criterion = None,
+        expected_direction: Criterion = None,
+        time_horizon: Criterion = None,
+    ) -> RowIds:
+        criteria = {
+            "sector": sector,
+            "country": country,
+            "expected_direction": expected_direction,
+            "time_horizon": time_horizon,
+        }
+        matches = [self._lookup(column, value) for column, value in criteria.items() if value is not None]
+        if not matches:
+            return tuple(range(len(self)))
+        # Intersect starting from the most selective index so the working set stays small.
+        matches.sort(key=len)
+        rows = matches[0]
+        for other in matches[1:]:
+            if not rows:
+                break
+            allowed = set(other)
+            rows = tuple(row for row in rows if row in allowed)
+        return rows
+
+    def record(self, row: int) -> Dict[str, object]:
+        record: Dict[str, object] = {name: column[row] for name, column in self.columns.items()}
+        record["investability_score"] = self.investability_scores[row]
+        record["sources"] = self.sources[row]
+        record["mechanism_template"] = self.mechanism_templates[row]
+        record["rationale_template"] = self.rationale_templates[row]
+        return record